@@ -22,6 +22,7 @@ if False:
 load_translations()
 
 __version__ = (0, 1, 9)
+PLUGIN_VERSION = ".".join([str(d) for d in __version__])
 PLUGIN_NAME = "overdrive_libby"
 PLUGIN_ICON = "images/plugin.svg"
 PLUGINS_FOLDER_NAME = "plugins"
@@ -32,11 +33,7 @@ DEMO_MODE = False  # make it easier for screenshots :P
 logger = logging.getLogger(__name__)
 ch = logging.StreamHandler(io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8"))
 ch.setLevel(logging.DEBUG)
-ch.setFormatter(
-    logging.Formatter(
-        f'[{PLUGIN_NAME}/{".".join([str(d) for d in __version__])}] %(message)s'
-    )
-)
+ch.setFormatter(logging.Formatter(f"[{PLUGIN_NAME}/{PLUGIN_VERSION}] %(message)s"))
 logger.addHandler(ch)
 logger.setLevel(logging.INFO if not DEBUG else logging.DEBUG)
 
@@ -8,23 +8,26 @@
 # information
 #
 import logging
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
 
 from calibre.constants import DEBUG, config_dir
-from calibre.gui2 import open_url
+from calibre.gui2 import error_dialog, open_url
 from calibre.gui2.actions import InterfaceAction
-from qt.core import QIcon, QPixmap, QSize, QToolButton
+from qt.core import QIcon, QSize, QThread, QToolButton
 
 from . import (
     DEMO_MODE,
     PLUGINS_FOLDER_NAME,
     PLUGIN_ICON,
     PLUGIN_NAME,
-    __version__,
+    PLUGIN_VERSION,
     logger,
 )
-from .compat import QColor_fromString, _c
-from .config import PREFS, PreferenceKeys, SearchMode
+from .compat import _c
+from .config import PREFS, PreferenceKeys, PreferenceTexts, SearchMode
 from .dialog import (
     BaseDialogMixin,
     CardsDialogMixin,
@@ -34,17 +37,31 @@ from .dialog import (
     SearchDialogMixin,
     AdvancedSearchDialogMixin,
 )
+from .libby import LibbyClient
 from .utils import (
     CARD_ICON,
     COVER_PLACEHOLDER,
     ICON_MAP,
+    LazyResources,
     PluginImages,
     SimpleCache,
+    clear_icon_cache,
     svg_to_qicon,
 )
+from .workers import LibbySetupCodeWorker
 
 PLUGIN_DIR = Path(config_dir, PLUGINS_FOLDER_NAME)
+ICON_CACHE_ROOT = PLUGIN_DIR.joinpath(f"{PLUGIN_NAME}.icons")
+# icons are cached per plugin version so that old ones can be removed
+ICON_CACHE_DIR = ICON_CACHE_ROOT.joinpath(PLUGIN_VERSION)
 CI_COMMIT_TXT = "commit.txt"
+# all the files extracted from the plugin zip
+PLUGIN_RESOURCES = [v.file for v in ICON_MAP.values()] + [
+    PLUGIN_ICON,
+    CARD_ICON,
+    COVER_PLACEHOLDER,
+    CI_COMMIT_TXT,
+]
 
 # noinspection PyUnreachableCode
 if False:
@@ -53,6 +70,26 @@ if False:
 load_translations()
 
 
+@lru_cache(maxsize=1)
+def load_plugin_resources() -> Mapping[str, bytes]:
+    """
+    Read all the plugin resources from the plugin zip in a single call.
+    The result is cached so that the zip is only read once per session.
+
+    :return:
+    """
+    try:
+        image_resources = get_resources(
+            PLUGIN_RESOURCES,
+            print_tracebacks_for_missing_resources=DEBUG,  # noqa
+        )
+    except TypeError:
+        # older than 6.2.0
+        # ref: https://github.com/kovidgoyal/calibre/commit/ef6c2b439f3870c9b87184a63441ede054db0e34
+        image_resources = get_resources(PLUGIN_RESOURCES)
+    return MappingProxyType(image_resources)
+
+
 class OverdriveLibbyAction(InterfaceAction):
     name = PLUGIN_NAME
     action_spec = (
@@ -68,110 +105,106 @@ class OverdriveLibbyAction(InterfaceAction):
     dont_add_to = frozenset(["context-menu-device"])
     main_dialog = None
     development_version = None
+    development_version_tag = ""  # e.g. "*abcdef1", appended to the version
 
     def genesis(self):
         # This method is called once per plugin, do initial setup here
 
+        self._setup_code_thread = QThread()
+        self._pending_setup_code = ""
+
+        device_pixel_ratio = self.gui.devicePixelRatio()
+
         # extract icons
-        try:
-            image_resources = get_resources(
-                [v.file for v in ICON_MAP.values()]
-                + [PLUGIN_ICON, CARD_ICON, COVER_PLACEHOLDER, CI_COMMIT_TXT],
-                print_tracebacks_for_missing_resources=DEBUG,  # noqa
-            )
-        except TypeError:
-            # older than 6.2.0
-            # ref: https://github.com/kovidgoyal/calibre/commit/ef6c2b439f3870c9b87184a63441ede054db0e34
-            image_resources = get_resources(
-                [v.file for v in ICON_MAP.values()]
-                + [PLUGIN_ICON, CARD_ICON, COVER_PLACEHOLDER, CI_COMMIT_TXT],
-            )
+        image_resources = load_plugin_resources()
+        # remove icons cached by other plugin versions
+        clear_icon_cache(ICON_CACHE_ROOT, keep=ICON_CACHE_DIR)
 
-        self.resources = {}
-        for k, v in ICON_MAP.items():
-            self.resources[k] = svg_to_qicon(
-                image_resources.pop(v.file), QColor_fromString(v.color)
-            )
+        # icons and the cover placeholder are only rendered when first used
+        self.resources = LazyResources(
+            image_resources,
+            cache_dir=ICON_CACHE_DIR,
+            device_pixel_ratio=device_pixel_ratio,
+        )
 
         # card icon
-        self.resources[PluginImages.Card] = image_resources.pop(CARD_ICON)
+        self.resources[PluginImages.Card] = image_resources[CARD_ICON]
         if CI_COMMIT_TXT in image_resources:
             self.development_version = (
-                image_resources.pop(CI_COMMIT_TXT).decode("utf-8").strip()
+                image_resources[CI_COMMIT_TXT].decode("utf-8").strip()
             )
+            self.development_version_tag = f"*{self.development_version[:7]}"
             if logger.handlers:
                 logger.handlers[0].setFormatter(
                     logging.Formatter(
-                        f'[{PLUGIN_NAME}/{".".join([str(d) for d in __version__])}'
-                        f"*{self.development_version[:7]}] %(message)s"
+                        f"[{PLUGIN_NAME}/{PLUGIN_VERSION}"
+                        f"{self.development_version_tag}] %(message)s"
                     )
                 )
 
-        # book cover placeholder
-        cover_pixmap = QPixmap(150, 200)
-        cover_pixmap.loadFromData(image_resources.pop(COVER_PLACEHOLDER))
-        cover_pixmap.setDevicePixelRatio(self.gui.devicePixelRatio())
-        self.resources[PluginImages.CoverPlaceholder] = cover_pixmap
-
         # action icon
-        plugin_icon = svg_to_qicon(image_resources.pop(PLUGIN_ICON), size=(300, 300))
+        plugin_icon = svg_to_qicon(
+            image_resources[PLUGIN_ICON], size=(300, 300), cache_dir=ICON_CACHE_DIR
+        )
         self.qaction.setIcon(plugin_icon)
         # set the cloned menu icon
-        mini_plugin_icon = QIcon(
-            plugin_icon.pixmap(QSize(32, 32), self.gui.devicePixelRatio())
-        )
+        mini_plugin_icon = QIcon(plugin_icon.pixmap(QSize(32, 32), device_pixel_ratio))
         self.menuless_qaction.setIcon(mini_plugin_icon)
         self.qaction.triggered.connect(self.show_dialog)
         qaction_menu = self.qaction.menu()
         qaction_menu.setToolTipsVisible(True)
 
-        self.create_menu_action(
-            qaction_menu,
-            "overdrive-libby-config",
-            _c("&Customize plugin"),
-            "config.png",
-            triggered=lambda: self.interface_action_base_plugin.do_user_config(
-                self.gui
+        # unique name, text, icon, description, triggered
+        menu_actions = (
+            (
+                "overdrive-libby-config",
+                _c("&Customize plugin"),
+                "config.png",
+                None,
+                lambda: self.interface_action_base_plugin.do_user_config(self.gui),
             ),
-        )
-        self.create_menu_action(
-            qaction_menu,
-            "overdrive-libby-clear-cache",
-            _("Clear cache"),
-            self.resources[PluginImages.Delete],
-            description=_("Clear cached data, e.g. titles, libraries"),
-            triggered=self.clear_cache,
-        )
-        self.create_menu_action(
-            qaction_menu,
-            "overdrive-libby-help",
-            _c("Help"),
-            "help.png",
-            description=_("View setup and usage help"),
-            triggered=lambda: open_url(
-                "https://github.com/ping/libby-calibre-plugin#setup"
+            (
+                "overdrive-libby-clear-cache",
+                _("Clear cache"),
+                self.resources[PluginImages.Delete],
+                _("Clear cached data, e.g. titles, libraries"),
+                self.clear_cache,
             ),
-        )
-        self.create_menu_action(
-            qaction_menu,
-            "overdrive-libby-changelog",
-            _("What's New"),
-            self.resources[PluginImages.Information],
-            description=_("See what's changed in the latest release"),
-            triggered=lambda: open_url(
-                "https://github.com/ping/libby-calibre-plugin/blob/main/CHANGELOG.md"
+            (
+                "overdrive-libby-help",
+                _c("Help"),
+                "help.png",
+                _("View setup and usage help"),
+                lambda: open_url("https://github.com/ping/libby-calibre-plugin#setup"),
             ),
-        )
-        self.create_menu_action(
-            qaction_menu,
-            "overdrive-libby-mr",
-            _("MobileRead"),
-            self.resources[PluginImages.ExternalLink],
-            description=_("Plugin thread on the MobileRead forums"),
-            triggered=lambda: open_url(
-                "https://www.mobileread.com/forums/showthread.php?t=354816"
+            (
+                "overdrive-libby-changelog",
+                _("What's New"),
+                self.resources[PluginImages.Information],
+                _("See what's changed in the latest release"),
+                lambda: open_url(
+                    "https://github.com/ping/libby-calibre-plugin/blob/main/CHANGELOG.md"
+                ),
+            ),
+            (
+                "overdrive-libby-mr",
+                _("MobileRead"),
+                self.resources[PluginImages.ExternalLink],
+                _("Plugin thread on the MobileRead forums"),
+                lambda: open_url(
+                    "https://www.mobileread.com/forums/showthread.php?t=354816"
+                ),
             ),
         )
+        for unique_name, text, icon, description, triggered in menu_actions:
+            self.create_menu_action(
+                qaction_menu,
+                unique_name,
+                text,
+                icon,
+                description=description,
+                triggered=triggered,
+            )
         self.libraries_cache = SimpleCache(
             persist_to_path=PLUGIN_DIR.joinpath(f"{PLUGIN_NAME}.libraries.json"),
             cache_age_days=PREFS[PreferenceKeys.CACHE_AGE_DAYS],
@@ -183,14 +216,12 @@ class OverdriveLibbyAction(InterfaceAction):
             logger=logger,
         )
 
-    def main_dialog_finished(self):
-        self.main_dialog = None
-
     def clear_cache(self):
         self.libraries_cache.clear()
         self.libraries_cache.save()
         self.media_cache.clear()
         self.media_cache.save()
+        clear_icon_cache(ICON_CACHE_ROOT)
 
     def show_dialog(self):
         base_plugin_object = self.interface_action_base_plugin
@@ -204,28 +235,114 @@ class OverdriveLibbyAction(InterfaceAction):
                 self.libraries_cache,
                 self.media_cache,
             )
-            self.main_dialog.finished.connect(self.main_dialog_finished)
             window_title = _("OverDrive Libby v{version}{dev}").format(
-                version=".".join([str(d) for d in __version__]),
-                dev=f"*{self.development_version[:7]}"
-                if self.development_version
-                else "",
+                version=PLUGIN_VERSION, dev=self.development_version_tag
             )
             if DEMO_MODE:
                 window_title = "OverDrive Libby"
             self.main_dialog.setWindowTitle(window_title)
+        elif not self.main_dialog.isVisible():
+            # the dialog is kept around after it is closed, so just refresh the data
+            self.main_dialog.sync()
         self.main_dialog.show()
         self.main_dialog.raise_()
         self.main_dialog.activateWindow()
 
     def apply_settings(self):
-        self.libraries_cache.cache_age_days = PREFS[PreferenceKeys.CACHE_AGE_DAYS]
-        self.media_cache.cache_age_days = PREFS[PreferenceKeys.CACHE_AGE_DAYS]
-        self.libraries_cache.reload()
-        self.media_cache.reload()
+        cache_age_days = PREFS[PreferenceKeys.CACHE_AGE_DAYS]
+        self.libraries_cache.set_cache_age_days(cache_age_days)
+        self.media_cache.set_cache_age_days(cache_age_days)
+        # settings are applied when the main UI is built, so discard it
+        # to make sure everything is consistent
+        self.discard_main_dialog()
+
+    def library_changed(self, db):
+        # the main UI matches books against the calibre library it was built with,
+        # so discard it when the user switches to another library
+        self.discard_main_dialog()
+
+    def discard_main_dialog(self):
         if self.main_dialog:
-            # close off main UI to make sure everything is consistent
             self.main_dialog.close()
+            self.main_dialog.deleteLater()
+            self.main_dialog = None
+
+    def setup_libby(self, setup_code: str):
+        """
+        Sets up Libby with a setup code from another device in a background thread,
+        so that the settings dialog is not blocked by the network requests.
+        The new identity token is saved and applied when done.
+
+        :param setup_code:
+        :return:
+        """
+        if self._setup_code_thread.isRunning():
+            # set up with the latest code entered when the running setup is done
+            self._pending_setup_code = setup_code
+            self.gui.status_bar.show_message(
+                _("Libby setup is in progress, the new setup code will be used next."),
+                5000,
+            )
+            return
+        self._setup_code_thread = self._get_setup_code_thread(setup_code)
+        self._setup_code_thread.start()
+
+    def _setup_code_thread_finished(self):
+        setup_code, self._pending_setup_code = self._pending_setup_code, ""
+        if setup_code and setup_code != PREFS[PreferenceKeys.LIBBY_SETUP_CODE]:
+            self.setup_libby(setup_code)
+
+    def _get_setup_code_thread(self, setup_code: str) -> QThread:
+        thread = QThread()
+        worker = LibbySetupCodeWorker()
+        worker.setup(
+            LibbyClient(
+                logger=logger,
+                timeout=PREFS[PreferenceKeys.NETWORK_TIMEOUT],
+                max_retries=PREFS[PreferenceKeys.NETWORK_RETRY],
+            ),
+            setup_code,
+        )
+        worker.moveToThread(thread)
+        thread.worker = worker
+        thread.started.connect(worker.run)
+        thread.finished.connect(self._setup_code_thread_finished)
+
+        def loaded(identity_token: str):
+            thread.quit()
+            if not identity_token:
+                logger.warning("Libby setup code was not accepted")
+                error_dialog(
+                    self.gui,
+                    PreferenceTexts.LIBBY_SETUP_CODE,
+                    _(
+                        "The setup code was not accepted. "
+                        "Please generate a new code and try again."
+                    ),
+                    show=True,
+                )
+                return
+            with PREFS:
+                PREFS[PreferenceKeys.LIBBY_SETUP_CODE] = setup_code
+                PREFS[PreferenceKeys.LIBBY_TOKEN] = identity_token
+            if self.main_dialog:
+                # use the new token in the open UI instead of rebuilding it
+                self.main_dialog.set_libby_token(identity_token)
+            self.gui.status_bar.show_message(PreferenceTexts.LIBBY_CONFIGURED, 5000)
+
+        def errored_out(err: Exception):
+            thread.quit()
+            error_dialog(
+                self.gui,
+                PreferenceTexts.LIBBY_SETUP_CODE,
+                str(err),
+                show=True,
+            )
+
+        worker.finished.connect(loaded)
+        worker.errored.connect(errored_out)
+
+        return thread
 
 
 class OverdriveLibbyDialog(
@@ -241,21 +358,23 @@ class OverdriveLibbyDialog(
         super().__init__(gui, icon, do_user_config, icons, libraries_cache, media_cache)
 
         # this non-intuitive code is because Windows
-        size_hint = self.sizeHint()
-        w = size_hint.width()
-        h = size_hint.height()
-        if (
-            PREFS[PreferenceKeys.MAIN_UI_WIDTH]
-            and PREFS[PreferenceKeys.MAIN_UI_WIDTH] > 0
-        ):
-            w = PREFS[PreferenceKeys.MAIN_UI_WIDTH]
-            logger.debug("Using saved window width: %d", w)
-        if (
-            PREFS[PreferenceKeys.MAIN_UI_HEIGHT]
-            and PREFS[PreferenceKeys.MAIN_UI_HEIGHT] > 0
-        ):
-            h = PREFS[PreferenceKeys.MAIN_UI_HEIGHT]
-            logger.debug("Using saved windows height: %d", h)
+        saved_width = PREFS[PreferenceKeys.MAIN_UI_WIDTH]
+        saved_height = PREFS[PreferenceKeys.MAIN_UI_HEIGHT]
+        if saved_width and saved_width > 0 and saved_height and saved_height > 0:
+            # skip the layout pass from sizeHint() if we don't need it
+            w = saved_width
+            h = saved_height
+            logger.debug("Using saved window size: (%d, %d)", w, h)
+        else:
+            size_hint = self.sizeHint()
+            w = size_hint.width()
+            h = size_hint.height()
+            if saved_width and saved_width > 0:
+                w = saved_width
+                logger.debug("Using saved window width: %d", w)
+            if saved_height and saved_height > 0:
+                h = saved_height
+                logger.debug("Using saved windows height: %d", h)
 
         logger.debug("Resizing window to: (%d, %d)", w, h)
         self.resize(QSize(w, h))
@@ -1,7 +1,7 @@
 #
 # Keep compat functions here
 #
-import re
+import string
 from typing import Tuple
 
 from qt.core import QColor, QHeaderView, QPainter, QSlider, QToolButton, Qt
@@ -18,7 +18,7 @@ except ImportError:
     _c = _
     ngettext_c = ngettext
 
-COLOR_HEX_RE = re.compile("^#[0-9a-f]{3,6}$", re.IGNORECASE)
+HEX_DIGITS = frozenset(string.hexdigits)
 
 try:
     QHeaderView_ResizeMode_Stretch = QHeaderView.ResizeMode.Stretch
@@ -71,7 +71,10 @@ def QColor_fromString(color: str) -> QColor:
     try:
         return QColor.fromString(color)
     except AttributeError:
-        return QColor(*hex_to_rgb(color))
+        # Let Qt parse the color instead of converting it with hex_to_rgb()
+        qcolor = QColor()
+        qcolor.setNamedColor(color)
+        return qcolor
 
 
 def hex_to_rgb(hexcolor: str) -> Tuple:
@@ -82,9 +85,14 @@ def hex_to_rgb(hexcolor: str) -> Tuple:
     :param hexcolor:
     :return:
     """
-    if not COLOR_HEX_RE.match(hexcolor):
+    if not (
+        hexcolor.startswith("#")
+        and len(hexcolor) in (4, 7)
+        and HEX_DIGITS.issuperset(hexcolor[1:])
+    ):
         raise ValueError(f"Invalid hexcode: {hexcolor}")
-    hexcolor = hexcolor.upper().lstrip("#")
+    hexcolor = hexcolor.lstrip("#")
     if len(hexcolor) == 3:
-        return tuple(int(hexcolor[i : i + 1] * 2, 16) for i in (0, 1, 2))
-    return tuple(int(hexcolor[i : i + 2], 16) for i in (0, 2, 4))
+        hexcolor = hexcolor[0] * 2 + hexcolor[1] * 2 + hexcolor[2] * 2
+    value = int(hexcolor, 16)
+    return (value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF
@@ -7,8 +7,11 @@
 # See https://github.com/ping/libby-calibre-plugin for more
 # information
 #
+import sys
 import time
-from typing import Tuple
+from collections import namedtuple
+from functools import lru_cache
+from typing import Dict, Iterable, Tuple
 
 from calibre import confirm_config_name
 from calibre.gui2 import error_dialog, show_restart_warning
@@ -42,6 +45,7 @@ from qt.core import (
 
 from . import DEMO_MODE, PLUGIN_NAME, PLUGINS_FOLDER_NAME, logger
 from .compat import _c
+from .libby import LibbyClient
 from .utils import PluginColors
 
 # noinspection PyUnreachableCode
@@ -51,6 +55,9 @@ if False:
 load_translations()
 
 MAX_SEARCH_LIBRARIES = 24
+# Style sheets for the Libby setup status label
+SETUP_STATUS_OK_STYLE = f"font-weight: bold; color: {PluginColors.Green};"
+SETUP_STATUS_NOT_OK_STYLE = f"font-weight: bold; color: {PluginColors.Red};"
 
 
 class PreferenceKeys:
@@ -133,6 +140,71 @@ class PreferenceTexts:
     CACHE_AGE_DAYS = _("Cache data for")
     DISABLE_TAB_MAGAZINES = _("Disable Magazines tab")
 
+    # Tabs and sections
+    LIBBY = _("Libby")
+    LOANS = _("Loans")
+    HOLDS = _("Holds")
+    SEARCH = _c("Search")
+    GENERAL = _("General")
+    NETWORK = _("Network")
+
+    # Libby
+    LIBBY_CONFIGURED = _("Libby is configured.")
+    LIBBY_NOT_CONFIGURED = _("Libby is not configured yet.")
+    LIBBY_SETUP_CODE_TOOLTIP = _(
+        "Enter the 8-digit Libby setup code generated from another device"
+    )
+    GENERATE_SETUP_CODE = _("Generate Setup Code")
+    GENERATE_SETUP_CODE_TOOLTIP = _("Generate setup code for another device")
+    HELP = _c("Help")
+
+    # Loans
+    TAG_EBOOKS_TOOLTIP = _("Add specified tags to the ebooks downloaded")
+    TAG_MAGAZINES_TOOLTIP = _("Add specified tags to the magazines downloaded")
+    CUSTCOL_BORROWED_DATE_TOOLTIP = _(
+        "If specified, this column will be updated with the loan checkout date"
+    )
+    CUSTCOL_DUE_DATE_TOOLTIP = _(
+        "If specified, this column will be updated with the loan expiry date"
+    )
+    CUSTCOL_LOAN_TYPE_TOOLTIP = _(
+        "If specified, this column will be updated with the loan type, e.g. ebook / magazine / audiobook."
+    )
+    CUSTCOL_BORROWED_DATE_DESC = _("Loan's borrowed/checkout date")
+    CUSTCOL_DUE_DATE_DESC = _("Loan's due/expiry date")
+    CUSTCOL_LOAN_TYPE_DESC = _("Loan type, e.g. ebook, audiobook, magazine")
+    CREATE_CUSTOM_COLUMN = _c("Create a custom column")
+
+    # Holds / Search
+    SEARCH_RESULTS_MAX_TOOLTIP = _("Limit the number of search results returned")
+    SEARCH_LIBRARIES_TOOLTIP = _(
+        "This determines the libraries that will be used for search."
+    )
+    SEARCH_LIBRARIES_PLACEHOLDER = _(
+        "Up to {n} libraries, comma-separated. View your library key codes from the Cards tab. "
+        "Example: lapl,sno-isle,livebrary,kcls"
+    ).format(n=MAX_SEARCH_LIBRARIES)
+
+    # General / Network
+    CACHE_AGE_DAYS_SUFFIX = _(" day(s)")
+    CACHE_AGE_DAYS_TOOLTIP = _(
+        "How long to retain cacheable data such as library information (max: {n} days)"
+    )
+    NETWORK_TIMEOUT_TOOLTIP = _(
+        "The maximum interval to wait on a connection. You can increase this value if you have a slow connection."
+    )
+    NETWORK_TIMEOUT_SUFFIX = _c(" seconds")
+    NETWORK_RETRY_TOOLTIP = _("The number of retries upon connection failures")
+
+
+# The PREFS keys that calibre's confirm() uses for the confirmation prompts
+CONFIRM_RETURNS_KEY = sys.intern(confirm_config_name(PreferenceKeys.CONFIRM_RETURNS))
+CONFIRM_CANCELLATIONS_KEY = sys.intern(
+    confirm_config_name(PreferenceKeys.CONFIRM_CANCELLATIONS)
+)
+CONFIRM_READ_WITH_KINDLE_KEY = sys.intern(
+    confirm_config_name(PreferenceKeys.CONFIRM_READ_WITH_KINDLE)
+)
 
 PREFS = JSONConfig(f"{PLUGINS_FOLDER_NAME}/{PLUGIN_NAME}")
 
@@ -147,9 +219,9 @@ PREFS.defaults[PreferenceKeys.HIDE_HOLDS_UNAVAILABLE] = True
 PREFS.defaults[PreferenceKeys.PREFER_OPEN_FORMATS] = True
 PREFS.defaults[PreferenceKeys.TAG_EBOOKS] = ""
 PREFS.defaults[PreferenceKeys.TAG_MAGAZINES] = ""
-PREFS.defaults[confirm_config_name(PreferenceKeys.CONFIRM_RETURNS)] = True
-PREFS.defaults[confirm_config_name(PreferenceKeys.CONFIRM_CANCELLATIONS)] = True
-PREFS.defaults[confirm_config_name(PreferenceKeys.CONFIRM_READ_WITH_KINDLE)] = True
+PREFS.defaults[CONFIRM_RETURNS_KEY] = True
+PREFS.defaults[CONFIRM_CANCELLATIONS_KEY] = True
+PREFS.defaults[CONFIRM_READ_WITH_KINDLE_KEY] = True
 PREFS.defaults[PreferenceKeys.OVERDRIVELINK_INTEGRATION] = True
 PREFS.defaults[PreferenceKeys.MARK_UPDATED_BOOKS] = True
 PREFS.defaults[PreferenceKeys.ALWAYS_DOWNLOAD_AS_NEW] = False
@@ -170,6 +242,147 @@ PREFS.defaults[PreferenceKeys.LAST_BORROW_ACTION] = BorrowActions.BORROW
 PREFS.defaults[PreferenceKeys.LAST_SELECTED_TAB] = 0
 PREFS.defaults[PreferenceKeys.SEARCH_MODE] = SearchMode.BASIC
 
+# A boolean preference that is edited with a QCheckBox in ConfigWidget
+CheckBoxPreference = namedtuple(
+    "CheckBoxPreference", ["widget_name", "key", "text", "tooltip"]
+)
+
+LOANS_CHECKBOX_PREFS = (
+    CheckBoxPreference(
+        "hide_ebooks_checkbox",
+        PreferenceKeys.HIDE_EBOOKS,
+        PreferenceTexts.HIDE_EBOOKS,
+        _("Don't list ebook loans"),
+    ),
+    CheckBoxPreference(
+        "hide_magazines_checkbox",
+        PreferenceKeys.HIDE_MAGAZINES,
+        PreferenceTexts.HIDE_MAGAZINES,
+        _("Don't list magazine loans"),
+    ),
+    CheckBoxPreference(
+        "hide_books_already_in_lib_checkbox",
+        PreferenceKeys.HIDE_BOOKS_ALREADY_IN_LIB,
+        PreferenceTexts.HIDE_BOOKS_ALREADY_IN_LIB,
+        _("Hide loans that are already in your calibre library"),
+    ),
+    CheckBoxPreference(
+        "exclude_empty_books_checkbox",
+        PreferenceKeys.EXCLUDE_EMPTY_BOOKS,
+        PreferenceTexts.EXCLUDE_EMPTY_BOOKS,
+        _(
+            "When enabled, empty books are excluded when hiding titles already in your library"
+        ),
+    ),
+    CheckBoxPreference(
+        "confirm_returns_checkbox",
+        CONFIRM_RETURNS_KEY,
+        PreferenceTexts.CONFIRM_RETURNS,
+        _("Toggle the confirmation prompt before returning loans"),
+    ),
+    CheckBoxPreference(
+        "confirm_readwithkindle_checkbox",
+        CONFIRM_READ_WITH_KINDLE_KEY,
+        PreferenceTexts.CONFIRM_READ_WITH_KINDLE,
+        _(
+            "Toggle the confirmation prompt before chosing to Read with Kindle a title that is not format-locked"
+        ),
+    ),
+    CheckBoxPreference(
+        "prefer_open_formats_checkbox",
+        PreferenceKeys.PREFER_OPEN_FORMATS,
+        PreferenceTexts.PREFER_OPEN_FORMATS,
+        _("Choose DRM-free formats if available"),
+    ),
+    CheckBoxPreference(
+        "enable_overdrive_link_checkbox",
+        PreferenceKeys.OVERDRIVELINK_INTEGRATION,
+        PreferenceTexts.OVERDRIVELINK_INTEGRATION,
+        _(
+            "If enabled, the plugin will attempt to find a matching OverDrive-linked book that does not have any formats and add the new download as an EPUB to the book record."
+            "<br>Newly downloaded books will also have the `odid` identifier added."
+        ),
+    ),
+    CheckBoxPreference(
+        "mark_updated_books_checkbox",
+        PreferenceKeys.MARK_UPDATED_BOOKS,
+        PreferenceTexts.MARK_UPDATED_BOOKS,
+        _(
+            "If enabled, book records that were updated with a new format will be marked."
+        ),
+    ),
+    CheckBoxPreference(
+        "always_download_as_new_checkbox",
+        PreferenceKeys.ALWAYS_DOWNLOAD_AS_NEW,
+        PreferenceTexts.ALWAYS_DOWNLOAD_AS_NEW,
+        _(
+            "Never update an existing empty book. Always create a new book entry for a download."
+        ),
+    ),
+)
+HOLDS_CHECKBOX_PREFS = (
+    CheckBoxPreference(
+        "hide_holds_unavailable_checkbox",
+        PreferenceKeys.HIDE_HOLDS_UNAVAILABLE,
+        PreferenceTexts.HIDE_HOLDS_UNAVAILABLE,
+        _("Hide holds that are not yet available"),
+    ),
+    CheckBoxPreference(
+        "confirm_cancel_hold_checkbox",
+        CONFIRM_CANCELLATIONS_KEY,
+        PreferenceTexts.CONFIRM_CANCELLATIONS,
+        _("Toggle the confirmation prompt before cancelling a hold"),
+    ),
+)
+GENERAL_CHECKBOX_PREFS = (
+    CheckBoxPreference(
+        "disable_tab_magazines_checkbox",
+        PreferenceKeys.DISABLE_TAB_MAGAZINES,
+        PreferenceTexts.DISABLE_TAB_MAGAZINES,
+        _("Disable the Magazines tab"),
+    ),
+    CheckBoxPreference(
+        "incl_nondownloadable_checkbox",
+        PreferenceKeys.INCL_NONDOWNLOADABLE_TITLES,
+        PreferenceTexts.INCL_NONDOWNLOADABLE_TITLES,
+        _(
+            "Include titles that do not have a supported downloadable format, "
+            "e.g. Kindle, audiobook loans"
+        ),
+    ),
+    CheckBoxPreference(
+        "use_best_cover_checkbox",
+        PreferenceKeys.USE_BEST_COVER,
+        PreferenceTexts.USE_BEST_COVER,
+        _("Use the best quality cover in book details. Maybe slower."),
+    ),
+)
+
+
+@lru_cache(maxsize=None)
+def custom_column_lookup_name(custom_field_prefix: str, col_type: str) -> str:
+    """
+    Returns the default lookup name for a plugin custom column, e.g. "#libby_due_date"
+
+    :param custom_field_prefix: calibre's custom field prefix, i.e. "#"
+    :param col_type:
+    :return:
+    """
+    return f"{custom_field_prefix}libby_{col_type.replace(' ', '_').lower()}"
+
+
+def create_form_layout(parent: QWidget) -> QFormLayout:
+    """
+    Sets a new QFormLayout, with fields that expand to fill the width, on parent.
+
+    :param parent:
+    :return:
+    """
+    form_layout = QFormLayout()
+    form_layout.setFieldGrowthPolicy(QFormLayout.ExpandingFieldsGrow)
+    parent.setLayout(form_layout)
+    return form_layout
+
 
 class ConfigWidget(QWidget):
     def __init__(self, plugin_action):
@@ -180,28 +393,68 @@ class ConfigWidget(QWidget):
         self.plugin_action = plugin_action
         self.gui = plugin_action.gui
         self.db = self.gui.current_db.new_api
-        # Setup Status
-        is_configured = bool(PREFS[PreferenceKeys.LIBBY_TOKEN])
-        if DEMO_MODE:
-            is_configured = False
         self.custom_column_creator = (
             CreateNewCustomColumn(self.gui) if CreateNewCustomColumn else None
         )
+        # set when the custom column fields are added to the Loans tab
+        self.has_custom_col_fields = False
 
         self.tabs = QTabWidget(self)
         self.layout.addWidget(self.tabs)
 
-        # ------------------------------------ LIBBY TAB ------------------------------------
-        libby_layout = QFormLayout()
-        libby_layout.setFieldGrowthPolicy(QFormLayout.ExpandingFieldsGrow)
-        libby_widget = QWidget()
-        libby_widget.setLayout(libby_layout)
-        self.tabs.addTab(libby_widget, _("Libby"))
+        # Tabs are populated only when they are first shown
+        self.libby_tab = QWidget()
+        self.loans_tab = QWidget()
+        self.holds_search_tab = QWidget()
+        self.general_network_tab = QWidget()
+        self.tab_builders = {
+            self.libby_tab: self.build_libby_tab,
+            self.loans_tab: self.build_loans_tab,
+            self.holds_search_tab: self.build_holds_search_tab,
+            self.general_network_tab: self.build_general_network_tab,
+        }
+        self.tabs.addTab(self.libby_tab, PreferenceTexts.LIBBY)
+        self.tabs.addTab(self.loans_tab, PreferenceTexts.LOANS)
+        self.tabs.addTab(
+            self.holds_search_tab,
+            PreferenceTexts.HOLDS + " / " + PreferenceTexts.SEARCH,
+        )
+        self.tabs.addTab(
+            self.general_network_tab,
+            PreferenceTexts.GENERAL + " / " + PreferenceTexts.NETWORK,
+        )
+        self.build_tab(self.tabs.currentIndex())
+        self.tabs.currentChanged.connect(self.build_tab)
+
+        self.resize(self.sizeHint())
+
+    def build_tab(self, index: int):
+        """
+        Populates the tab at index if it has not been built yet.
+
+        :param index:
+        :return:
+        """
+        tab = self.tabs.widget(index)
+        builder = self.tab_builders.pop(tab, None)
+        if builder:
+            builder(tab)
+
+    def is_tab_built(self, tab: QWidget) -> bool:
+        return tab not in self.tab_builders
+
+    def build_libby_tab(self, tab: QWidget):
+        libby_layout = create_form_layout(tab)
+
+        # Setup Status
+        is_configured = bool(PREFS[PreferenceKeys.LIBBY_TOKEN])
+        if DEMO_MODE:
+            is_configured = False
 
         self.libby_setup_status_lbl = QLabel(
-            _("Libby is configured.")
+            PreferenceTexts.LIBBY_CONFIGURED
             if is_configured
-            else _("Libby is not configured yet.")
+            else PreferenceTexts.LIBBY_NOT_CONFIGURED
         )
         # bump up font size a little
         curr_font = self.libby_setup_status_lbl.font()
@@ -209,7 +462,7 @@ class ConfigWidget(QWidget):
         self.libby_setup_status_lbl.setFont(curr_font)
         # color
         self.libby_setup_status_lbl.setStyleSheet(
-            f"font-weight: bold; color: {PluginColors.Green if is_configured else PluginColors.Red};"
+            SETUP_STATUS_OK_STYLE if is_configured else SETUP_STATUS_NOT_OK_STYLE
         )
         libby_layout.addRow(self.libby_setup_status_lbl)
 
@@ -223,9 +476,7 @@ class ConfigWidget(QWidget):
         self.libby_setup_code_lbl.setOpenExternalLinks(True)
         self.libby_setup_code_lbl.setMinimumWidth(150)
         self.libby_setup_code_txt = QLineEdit(self)
-        self.libby_setup_code_txt.setToolTip(
-            _("Enter the 8-digit Libby setup code generated from another device")
-        )
+        self.libby_setup_code_txt.setToolTip(PreferenceTexts.LIBBY_SETUP_CODE_TOOLTIP)
         self.libby_setup_code_txt.setPlaceholderText(
             PreferenceTexts.LIBBY_SETUP_CODE_DESC
         )
@@ -239,9 +490,11 @@ class ConfigWidget(QWidget):
 
         if is_configured:
             generate_code_layout = QHBoxLayout()
-            self.generate_code_btn = QPushButton(_("Generate Setup Code"), self)
+            self.generate_code_btn = QPushButton(
+                PreferenceTexts.GENERATE_SETUP_CODE, self
+            )
             self.generate_code_btn.setToolTip(
-                _("Generate setup code for another device")
+                PreferenceTexts.GENERATE_SETUP_CODE_TOOLTIP
             )
             self.generate_code_btn.setMinimumWidth(150)
             self.generate_code_btn.clicked.connect(self.generate_code_btn_clicked)
@@ -258,7 +511,7 @@ class ConfigWidget(QWidget):
         # Help label
         self.help_lbl = QLabel(
             '<a style="padding: 0 4px;" href="https://github.com/ping/libby-calibre-plugin#setup">'
-            + _c("Help")
+            + PreferenceTexts.HELP
             + "</a>"
         )
         self.help_lbl.setAlignment(Qt.AlignRight)
@@ -266,133 +519,14 @@ class ConfigWidget(QWidget):
         self.help_lbl.setOpenExternalLinks(True)
         libby_layout.addRow(self.help_lbl)
 
-        # ------------------------------------ LOANS TAB ------------------------------------
-        loan_layout = QFormLayout()
-        loan_layout.setFieldGrowthPolicy(QFormLayout.ExpandingFieldsGrow)
-        loans_widget = QWidget()
-        loans_widget.setLayout(loan_layout)
-        self.tabs.addTab(loans_widget, _("Loans"))
-
-        # Hide Ebooks
-        self.hide_ebooks_checkbox = QCheckBox(PreferenceTexts.HIDE_EBOOKS, self)
-        self.hide_ebooks_checkbox.setToolTip(_("Don't list ebook loans"))
-        self.hide_ebooks_checkbox.setChecked(PREFS[PreferenceKeys.HIDE_EBOOKS])
-        loan_layout.addRow(self.hide_ebooks_checkbox)
-
-        # Hide Magazine
-        self.hide_magazines_checkbox = QCheckBox(PreferenceTexts.HIDE_MAGAZINES, self)
-        self.hide_magazines_checkbox.setToolTip(_("Don't list magazine loans"))
-        self.hide_magazines_checkbox.setChecked(PREFS[PreferenceKeys.HIDE_MAGAZINES])
-        loan_layout.addRow(self.hide_magazines_checkbox)
-
-        # Hide books already in library
-        self.hide_books_already_in_lib_checkbox = QCheckBox(
-            PreferenceTexts.HIDE_BOOKS_ALREADY_IN_LIB, self
-        )
-        self.hide_books_already_in_lib_checkbox.setToolTip(
-            _("Hide loans that are already in your calibre library")
-        )
-        self.hide_books_already_in_lib_checkbox.setChecked(
-            PREFS[PreferenceKeys.HIDE_BOOKS_ALREADY_IN_LIB]
-        )
-        loan_layout.addRow(self.hide_books_already_in_lib_checkbox)
-
-        # Exclude empty books when hiding titles already in library
-        self.exclude_empty_books_checkbox = QCheckBox(
-            PreferenceTexts.EXCLUDE_EMPTY_BOOKS, self
-        )
-        self.exclude_empty_books_checkbox.setToolTip(
-            _(
-                "When enabled, empty books are excluded when hiding titles already in your library"
-            )
-        )
-        self.exclude_empty_books_checkbox.setChecked(
-            PREFS[PreferenceKeys.EXCLUDE_EMPTY_BOOKS]
-        )
-        loan_layout.addRow(self.exclude_empty_books_checkbox)
-
-        # Always confirm returns
-        self.confirm_returns_checkbox = QCheckBox(PreferenceTexts.CONFIRM_RETURNS, self)
-        self.confirm_returns_checkbox.setToolTip(
-            _("Toggle the confirmation prompt before returning loans")
-        )
-        self.confirm_returns_checkbox.setChecked(
-            PREFS[confirm_config_name(PreferenceKeys.CONFIRM_RETURNS)]
-        )
-        loan_layout.addRow(self.confirm_returns_checkbox)
-
-        # Always confirm Read with Kindle
-        self.confirm_readwithkindle_checkbox = QCheckBox(
-            PreferenceTexts.CONFIRM_READ_WITH_KINDLE, self
-        )
-        self.confirm_readwithkindle_checkbox.setToolTip(
-            _(
-                "Toggle the confirmation prompt before chosing to Read with Kindle a title that is not format-locked"
-            )
-        )
-        self.confirm_readwithkindle_checkbox.setChecked(
-            PREFS[confirm_config_name(PreferenceKeys.CONFIRM_READ_WITH_KINDLE)]
-        )
-        loan_layout.addRow(self.confirm_readwithkindle_checkbox)
-
-        # Prefer Open Formats
-        self.prefer_open_formats_checkbox = QCheckBox(
-            PreferenceTexts.PREFER_OPEN_FORMATS, self
-        )
-        self.prefer_open_formats_checkbox.setToolTip(
-            _("Choose DRM-free formats if available")
-        )
-        self.prefer_open_formats_checkbox.setChecked(
-            PREFS[PreferenceKeys.PREFER_OPEN_FORMATS]
-        )
-        loan_layout.addRow(self.prefer_open_formats_checkbox)
-
-        # Enable OverDrive Link plugin integration
-        self.enable_overdrive_link_checkbox = QCheckBox(
-            PreferenceTexts.OVERDRIVELINK_INTEGRATION, self
-        )
-        self.enable_overdrive_link_checkbox.setToolTip(
-            _(
-                "If enabled, the plugin will attempt to find a matching OverDrive-linked book that does not have any formats and add the new download as an EPUB to the book record."
-                "<br>Newly downloaded books will also have the `odid` identifier added."
-            )
-        )
-        self.enable_overdrive_link_checkbox.setChecked(
-            PREFS[PreferenceKeys.OVERDRIVELINK_INTEGRATION]
-        )
-        loan_layout.addRow(self.enable_overdrive_link_checkbox)
-
-        # Mark updated books
-        self.mark_updated_books_checkbox = QCheckBox(
-            PreferenceTexts.MARK_UPDATED_BOOKS, self
-        )
-        self.mark_updated_books_checkbox.setToolTip(
-            _(
-                "If enabled, book records that were updated with a new format will be marked."
-            )
-        )
-        self.mark_updated_books_checkbox.setChecked(
-            PREFS[PreferenceKeys.MARK_UPDATED_BOOKS]
-        )
-        loan_layout.addRow(self.mark_updated_books_checkbox)
+    def build_loans_tab(self, tab: QWidget):
+        loan_layout = create_form_layout(tab)
 
-        # Always download as a new book
-        self.always_download_as_new_checkbox = QCheckBox(
-            PreferenceTexts.ALWAYS_DOWNLOAD_AS_NEW, self
-        )
-        self.always_download_as_new_checkbox.setToolTip(
-            _(
-                "Never update an existing empty book. Always create a new book entry for a download."
-            )
-        )
-        self.always_download_as_new_checkbox.setChecked(
-            PREFS[PreferenceKeys.ALWAYS_DOWNLOAD_AS_NEW]
-        )
-        loan_layout.addRow(self.always_download_as_new_checkbox)
+        self.add_checkbox_rows(loan_layout, LOANS_CHECKBOX_PREFS)
 
         # Tag Ebooks
         self.tag_ebooks_txt = QLineEdit(self)
-        self.tag_ebooks_txt.setToolTip(_("Add specified tags to the ebooks downloaded"))
+        self.tag_ebooks_txt.setToolTip(PreferenceTexts.TAG_EBOOKS_TOOLTIP)
         self.tag_ebooks_txt.setPlaceholderText(PreferenceTexts.TAG_EBOOKS_PLACEHOLDER)
         if not DEMO_MODE:
             self.tag_ebooks_txt.setText(PREFS[PreferenceKeys.TAG_EBOOKS])
@@ -400,9 +534,7 @@ class ConfigWidget(QWidget):
 
         # Tag Magazines
         self.tag_magazines_txt = QLineEdit(self)
-        self.tag_magazines_txt.setToolTip(
-            _("Add specified tags to the magazines downloaded")
-        )
+        self.tag_magazines_txt.setToolTip(PreferenceTexts.TAG_MAGAZINES_TOOLTIP)
         self.tag_magazines_txt.setPlaceholderText(
             PreferenceTexts.TAG_MAGAZINES_PLACEHOLDER
         )
@@ -411,6 +543,7 @@ class ConfigWidget(QWidget):
         loan_layout.addRow(PreferenceTexts.TAG_MAGAZINES, self.tag_magazines_txt)
 
         if self.custom_column_creator:
+            field_metadata = self.db.field_metadata
             # set custom columns to store borrow and due dates
             borrow_date_col_layout = QHBoxLayout()
             due_date_col_layout = QHBoxLayout()
@@ -419,17 +552,13 @@ class ConfigWidget(QWidget):
             borrow_date_col_lbl = QLabel(PreferenceTexts.CUSTCOL_BORROWED_DATE)
             self.borrow_date_col_text = QLineEdit(self)
             self.borrow_date_col_text.setToolTip(
-                _(
-                    "If specified, this column will be updated with the loan checkout date"
-                )
+                PreferenceTexts.CUSTCOL_BORROWED_DATE_TOOLTIP
             )
             self.borrow_date_col_text.setClearButtonEnabled(True)
             self.borrow_date_col_text.setText(
                 PREFS[PreferenceKeys.CUSTCOL_BORROWED_DATE]
-                if self.db.field_metadata.has_key(
-                    self.custom_column_name("borrowed date")
-                )
-                and not DEMO_MODE
+                if not DEMO_MODE
+                and field_metadata.has_key(self.custom_column_name("borrowed date"))
                 else ""
             )
             borrow_date_col_lbl.setBuddy(self.borrow_date_col_text)
@@ -438,14 +567,12 @@ class ConfigWidget(QWidget):
 
             due_date_col_lbl = QLabel(PreferenceTexts.CUSTCOL_DUE_DATE)
             self.due_date_col_text = QLineEdit(self)
-            self.due_date_col_text.setToolTip(
-                _("If specified, this column will be updated with the loan expiry date")
-            )
+            self.due_date_col_text.setToolTip(PreferenceTexts.CUSTCOL_DUE_DATE_TOOLTIP)
             self.due_date_col_text.setClearButtonEnabled(True)
             self.due_date_col_text.setText(
                 PREFS[PreferenceKeys.CUSTCOL_DUE_DATE]
-                if self.db.field_metadata.has_key(self.custom_column_name("due date"))
-                and not DEMO_MODE
+                if not DEMO_MODE
+                and field_metadata.has_key(self.custom_column_name("due date"))
                 else ""
             )
             due_date_col_lbl.setBuddy(self.due_date_col_text)
@@ -455,135 +582,98 @@ class ConfigWidget(QWidget):
             loan_type_col_lbl = QLabel(PreferenceTexts.CUSTCOL_LOAN_TYPE)
             self.loan_type_col_text = QLineEdit(self)
             self.loan_type_col_text.setToolTip(
-                _(
-                    "If specified, this column will be updated with the loan type, e.g. ebook / magazine / audiobook."
-                )
+                PreferenceTexts.CUSTCOL_LOAN_TYPE_TOOLTIP
             )
             self.loan_type_col_text.setClearButtonEnabled(True)
             self.loan_type_col_text.setText(
                 PREFS[PreferenceKeys.CUSTCOL_LOAN_TYPE]
-                if self.db.field_metadata.has_key(self.custom_column_name("loan type"))
-                and not DEMO_MODE
+                if not DEMO_MODE
+                and field_metadata.has_key(self.custom_column_name("loan type"))
                 else ""
             )
             loan_type_col_lbl.setBuddy(self.loan_type_col_text)
             loan_type_col_layout.addWidget(loan_type_col_lbl)
             loan_type_col_layout.addWidget(self.loan_type_col_text)
 
-            label_min_width = max(
-                due_date_col_lbl.sizeHint().width(),
-                borrow_date_col_lbl.sizeHint().width(),
-                loan_type_col_lbl.sizeHint().width(),
+            custom_col_labels = (
+                borrow_date_col_lbl,
+                due_date_col_lbl,
+                loan_type_col_lbl,
             )
-            due_date_col_lbl.setMinimumWidth(label_min_width)
-            borrow_date_col_lbl.setMinimumWidth(label_min_width)
-            loan_type_col_lbl.setMinimumWidth(label_min_width)
-
-            custom_col_buttons = []
-            self.borrow_date_col_add_btn = None
-            if not self.borrow_date_col_text.text():
-                self.borrow_date_col_add_btn = QPushButton("", self)
-                self.borrow_date_col_add_btn.clicked.connect(
-                    lambda: self.create_custom_column(
-                        self.borrow_date_col_text,
-                        "borrowed date",
-                        "datetime",
-                        {"description": _("Loan's borrowed/checkout date")},
-                    )
-                )
-                custom_col_buttons.append(self.borrow_date_col_add_btn)
-            self.due_date_col_add_btn = None
-            if not self.due_date_col_text.text():
-                self.due_date_col_add_btn = QPushButton("", self)
-                self.due_date_col_add_btn.clicked.connect(
-                    lambda: self.create_custom_column(
-                        self.due_date_col_text,
-                        "due date",
-                        "datetime",
-                        {"description": _("Loan's due/expiry date")},
+            label_min_width = max(lbl.sizeHint().width() for lbl in custom_col_labels)
+            for lbl in custom_col_labels:
+                lbl.setMinimumWidth(label_min_width)
+
+            # (text field, layout, column type, data type, description)
+            custom_col_fields = (
+                (
+                    self.borrow_date_col_text,
+                    borrow_date_col_layout,
+                    "borrowed date",
+                    "datetime",
+                    PreferenceTexts.CUSTCOL_BORROWED_DATE_DESC,
+                ),
+                (
+                    self.due_date_col_text,
+                    due_date_col_layout,
+                    "due date",
+                    "datetime",
+                    PreferenceTexts.CUSTCOL_DUE_DATE_DESC,
+                ),
+                (
+                    self.loan_type_col_text,
+                    loan_type_col_layout,
+                    "loan type",
+                    "text",
+                    PreferenceTexts.CUSTCOL_LOAN_TYPE_DESC,
+                ),
+            )
+            plus_icon = QIcon.ic("plus.png")
+            for (
+                txt_widget,
+                layout,
+                col_type,
+                data_type,
+                description,
+            ) in custom_col_fields:
+                if not txt_widget.text():
+                    add_btn = QPushButton("", self)
+                    add_btn.setIcon(plus_icon)
+                    add_btn.setToolTip(PreferenceTexts.CREATE_CUSTOM_COLUMN)
+                    create_args = (
+                        txt_widget,
+                        col_type,
+                        data_type,
+                        {"description": description},
                     )
-                )
-                custom_col_buttons.append(self.due_date_col_add_btn)
-            self.loan_type_col_add_btn = None
-            if not self.loan_type_col_text.text():
-                self.loan_type_col_add_btn = QPushButton("", self)
-                self.loan_type_col_add_btn.clicked.connect(
-                    lambda: self.create_custom_column(
-                        self.loan_type_col_text,
-                        "loan type",
-                        "text",
-                        {
-                            "description": _(
-                                "Loan type, e.g. ebook, audiobook, magazine"
-                            )
-                        },
+                    add_btn.clicked.connect(
+                        lambda checked, a=create_args: self.create_custom_column(*a)
                     )
-                )
-                custom_col_buttons.append(self.loan_type_col_add_btn)
-            for btn in custom_col_buttons:
-                btn.setIcon(QIcon.ic("plus.png"))
-                btn.setToolTip(_c("Create a custom column"))
-            if self.borrow_date_col_add_btn:
-                borrow_date_col_layout.addWidget(self.borrow_date_col_add_btn)
-            if self.due_date_col_add_btn:
-                due_date_col_layout.addWidget(self.due_date_col_add_btn)
-            if self.loan_type_col_add_btn:
-                loan_type_col_layout.addWidget(self.loan_type_col_add_btn)
-            for layout in (
-                borrow_date_col_layout,
-                due_date_col_layout,
-                loan_type_col_layout,
-            ):
+                    layout.addWidget(add_btn)
                 layout.setStretch(1, 1)
                 loan_layout.addRow(layout)
+            self.has_custom_col_fields = True
 
-        # ------------------------------------ HOLDS / SEARCH TAB ------------------------------------
-        # ------------------------------------ Holds ------------------------------------
+    def build_holds_search_tab(self, tab: QWidget):
         hold_search_layout = QVBoxLayout()
-        holds_search_widget = QWidget()
-        holds_search_widget.setLayout(hold_search_layout)
-        self.tabs.addTab(holds_search_widget, _("Holds") + " / " + _c("Search"))
-
-        holds_section = QGroupBox(_("Holds"))
-        holds_layout = QFormLayout()
-        holds_layout.setFieldGrowthPolicy(QFormLayout.ExpandingFieldsGrow)
-        holds_section.setLayout(holds_layout)
-        hold_search_layout.addWidget(holds_section)
+        tab.setLayout(hold_search_layout)
 
-        # Hide unavailable holds
-        self.hide_holds_unavailable_checkbox = QCheckBox(
-            PreferenceTexts.HIDE_HOLDS_UNAVAILABLE, self
-        )
-        self.hide_holds_unavailable_checkbox.setToolTip(
-            _("Hide holds that are not yet available")
-        )
-        self.hide_holds_unavailable_checkbox.setChecked(
-            PREFS[PreferenceKeys.HIDE_HOLDS_UNAVAILABLE]
-        )
-        holds_layout.addRow(self.hide_holds_unavailable_checkbox)
+        # ------------------------------------ Holds ------------------------------------
 
-        # Always confirm cancellations
-        self.confirm_cancel_hold_checkbox = QCheckBox(
-            PreferenceTexts.CONFIRM_CANCELLATIONS, self
-        )
-        self.confirm_cancel_hold_checkbox.setToolTip(
-            _("Toggle the confirmation prompt before cancelling a hold")
-        )
-        self.confirm_cancel_hold_checkbox.setChecked(
-            PREFS[confirm_config_name(PreferenceKeys.CONFIRM_CANCELLATIONS)]
-        )
-        holds_layout.addRow(self.confirm_cancel_hold_checkbox)
+        holds_section = QGroupBox(PreferenceTexts.HOLDS)
+        hold_search_layout.addWidget(holds_section)
+        holds_layout = create_form_layout(holds_section)
+
+        self.add_checkbox_rows(holds_layout, HOLDS_CHECKBOX_PREFS)
 
         # ------------------------------------ Search ------------------------------------
-        search_section = QGroupBox(_c("Search"))
-        search_layout = QFormLayout()
-        search_layout.setFieldGrowthPolicy(QFormLayout.ExpandingFieldsGrow)
-        search_section.setLayout(search_layout)
+        search_section = QGroupBox(PreferenceTexts.SEARCH)
         hold_search_layout.addWidget(search_section)
+        search_layout = create_form_layout(search_section)
 
         self.search_results_max_txt = QSpinBox(self)
         self.search_results_max_txt.setToolTip(
-            _("Limit the number of search results returned")
+            PreferenceTexts.SEARCH_RESULTS_MAX_TOOLTIP
         )
         self.search_results_max_txt.setRange(20, 60)
         self.search_results_max_txt.setSingleStep(10)
@@ -592,15 +682,10 @@ class ConfigWidget(QWidget):
             PreferenceTexts.SEARCH_RESULTS_MAX, self.search_results_max_txt
         )
         self.search_libraries_txt = QTextEdit(self)
-        self.search_libraries_txt.setToolTip(
-            _("This determines the libraries that will be used for search.")
-        )
+        self.search_libraries_txt.setToolTip(PreferenceTexts.SEARCH_LIBRARIES_TOOLTIP)
         self.search_libraries_txt.setAcceptRichText(False)
         self.search_libraries_txt.setPlaceholderText(
-            _(
-                "Up to {n} libraries, comma-separated. View your library key codes from the Cards tab. "
-                "Example: lapl,sno-isle,livebrary,kcls"
-            ).format(n=MAX_SEARCH_LIBRARIES)
+            PreferenceTexts.SEARCH_LIBRARIES_PLACEHOLDER
         )
         self.search_libraries_txt.setPlainText(
             ",".join(PREFS[PreferenceKeys.SEARCH_LIBRARIES])
@@ -612,96 +697,90 @@ class ConfigWidget(QWidget):
         search_libraries_layout.addWidget(self.search_libraries_txt)
         search_layout.addRow(search_libraries_layout)
 
-        # ------------------------------------ GENERAL / NETWORK TAB ------------------------------------
-        # ------------------------------------ General ------------------------------------
+    def build_general_network_tab(self, tab: QWidget):
         general_network_layout = QVBoxLayout()
-        general_network_widget = QWidget()
-        general_network_widget.setLayout(general_network_layout)
-        self.tabs.addTab(general_network_widget, _("General") + " / " + _("Network"))
-
-        general_section = QGroupBox(_("General"))
-        general_layout = QFormLayout()
-        general_layout.setFieldGrowthPolicy(QFormLayout.ExpandingFieldsGrow)
-        general_section.setLayout(general_layout)
-        general_network_layout.addWidget(general_section)
+        tab.setLayout(general_network_layout)
 
-        # Disable Magazines tab
-        self.disable_tab_magazines_checkbox = QCheckBox(
-            PreferenceTexts.DISABLE_TAB_MAGAZINES
-        )
-        self.disable_tab_magazines_checkbox.setToolTip(_("Disable the Magazines tab"))
-        self.disable_tab_magazines_checkbox.setChecked(
-            PREFS[PreferenceKeys.DISABLE_TAB_MAGAZINES]
-        )
-        general_layout.addRow(self.disable_tab_magazines_checkbox)
+        # ------------------------------------ General ------------------------------------
 
-        # Include non-downloadables
-        self.incl_nondownloadable_checkbox = QCheckBox(
-            PreferenceTexts.INCL_NONDOWNLOADABLE_TITLES
-        )
-        self.incl_nondownloadable_checkbox.setToolTip(
-            _(
-                "Include titles that do not have a supported downloadable format, "
-                "e.g. Kindle, audiobook loans"
-            )
-        )
-        self.incl_nondownloadable_checkbox.setChecked(
-            PREFS[PreferenceKeys.INCL_NONDOWNLOADABLE_TITLES]
-        )
-        general_layout.addRow(self.incl_nondownloadable_checkbox)
+        general_section = QGroupBox(PreferenceTexts.GENERAL)
+        general_network_layout.addWidget(general_section)
+        general_layout = create_form_layout(general_section)
 
-        # Use best cover
-        self.use_best_cover_checkbox = QCheckBox(PreferenceTexts.USE_BEST_COVER, self)
-        self.use_best_cover_checkbox.setToolTip(
-            _("Use the best quality cover in book details. Maybe slower.")
-        )
-        self.use_best_cover_checkbox.setChecked(PREFS[PreferenceKeys.USE_BEST_COVER])
-        general_layout.addRow(self.use_best_cover_checkbox)
+        self.add_checkbox_rows(general_layout, GENERAL_CHECKBOX_PREFS)
 
         self.cache_age_txt = QSpinBox(self)
-        self.cache_age_txt.setSuffix(_(" day(s)"))
+        self.cache_age_txt.setSuffix(PreferenceTexts.CACHE_AGE_DAYS_SUFFIX)
         self.cache_age_txt.setRange(0, 30)
         self.cache_age_txt.setToolTip(
-            _(
-                "How long to retain cacheable data such as library information (max: {n} days)"
-            ).format(n=self.cache_age_txt.maximum())
+            PreferenceTexts.CACHE_AGE_DAYS_TOOLTIP.format(
+                n=self.cache_age_txt.maximum()
+            )
         )
         self.cache_age_txt.setSingleStep(1)
         self.cache_age_txt.setValue(PREFS[PreferenceKeys.CACHE_AGE_DAYS])
         general_layout.addRow(PreferenceTexts.CACHE_AGE_DAYS, self.cache_age_txt)
 
         # ------------------------------------ Network ------------------------------------
-        network_section = QGroupBox(_("Network"))
-        network_layout = QFormLayout()
-        network_layout.setFieldGrowthPolicy(QFormLayout.ExpandingFieldsGrow)
-        network_section.setLayout(network_layout)
+        network_section = QGroupBox(PreferenceTexts.NETWORK)
         general_network_layout.addWidget(network_section)
+        network_layout = create_form_layout(network_section)
 
         self.network_timeout_txt = QSpinBox(self)
-        self.network_timeout_txt.setToolTip(
-            _(
-                "The maximum interval to wait on a connection. You can increase this value if you have a slow connection."
-            )
-        )
-        self.network_timeout_txt.setSuffix(_c(" seconds"))
+        self.network_timeout_txt.setToolTip(PreferenceTexts.NETWORK_TIMEOUT_TOOLTIP)
+        self.network_timeout_txt.setSuffix(PreferenceTexts.NETWORK_TIMEOUT_SUFFIX)
         self.network_timeout_txt.setRange(10, 180)
         self.network_timeout_txt.setSingleStep(10)
         self.network_timeout_txt.setValue(PREFS[PreferenceKeys.NETWORK_TIMEOUT])
         network_layout.addRow(PreferenceTexts.NETWORK_TIMEOUT, self.network_timeout_txt)
 
         self.network_retry_txt = QSpinBox(self)
-        self.network_retry_txt.setToolTip(
-            _("The number of retries upon connection failures")
-        )
+        self.network_retry_txt.setToolTip(PreferenceTexts.NETWORK_RETRY_TOOLTIP)
         self.network_retry_txt.setRange(0, 5)
         self.network_retry_txt.setValue(PREFS[PreferenceKeys.NETWORK_RETRY])
         network_layout.addRow(PreferenceTexts.NETWORK_RETRY, self.network_retry_txt)
 
-        self.resize(self.sizeHint())
+    def add_checkbox_rows(
+        self, layout: QFormLayout, checkbox_prefs: Iterable[CheckBoxPreference]
+    ):
+        """
+        Adds a QCheckBox row to the layout for each preference.
+        The checkbox is also set as an attribute named `widget_name`.
 
-    def generate_code_btn_clicked(self):
-        from .libby import LibbyClient
+        :param layout:
+        :param checkbox_prefs:
+        :return:
+        """
+        for checkbox_pref in checkbox_prefs:
+            checkbox = QCheckBox(checkbox_pref.text, self)
+            checkbox.setToolTip(checkbox_pref.tooltip)
+            checkbox.setChecked(PREFS[checkbox_pref.key])
+            setattr(self, checkbox_pref.widget_name, checkbox)
+            layout.addRow(checkbox)
+
+    def get_checkbox_values(
+        self, checkbox_prefs: Iterable[CheckBoxPreference]
+    ) -> Dict[str, bool]:
+        return {
+            checkbox_pref.key: getattr(self, checkbox_pref.widget_name).isChecked()
+            for checkbox_pref in checkbox_prefs
+        }
+
+    def get_spinbox_value(self, spinbox: QSpinBox, key: str) -> int:
+        """
+        Get the int value of a spinbox, falling back to the saved preference
+        if the text cannot be parsed, e.g. when it has been cleared.
+
+        :param spinbox:
+        :param key: PreferenceKeys key
+        :return:
+        """
+        try:
+            return int(spinbox.cleanText().strip())
+        except ValueError:
+            return PREFS[key]
 
+    def generate_code_btn_clicked(self):
         client = LibbyClient(
             identity_token=PREFS[PreferenceKeys.LIBBY_TOKEN],
             max_retries=PREFS[PreferenceKeys.NETWORK_RETRY],
@@ -740,9 +819,9 @@ class ConfigWidget(QWidget):
             )
 
     def custom_column_name(self, col_type: str):
-        for c in (" ",):
-            col_type = col_type.replace(c, "_")
-        return f"{self.db.field_metadata.custom_field_prefix}libby_{col_type.lower()}"
+        return custom_column_lookup_name(
+            self.db.field_metadata.custom_field_prefix, col_type
+        )
 
     def create_custom_column(
         self, txt_widget, col_type: str, data_type: str, display=None
@@ -777,12 +856,7 @@ class ConfigWidget(QWidget):
             return error_dialog(self, str(result[0]), result[1], show=True)
 
     def get_custom_col_names(self) -> Tuple[str, str, str]:
-        if (
-            self.custom_column_creator
-            and hasattr(self, "borrow_date_col_text")
-            and hasattr(self, "due_date_col_text")
-            and hasattr(self, "loan_type_col_text")
-        ):
+        if self.has_custom_col_fields:
             borrowed_date_custcol_name = (
                 self.borrow_date_col_text.text() or ""
             ).strip()
@@ -806,35 +880,10 @@ class ConfigWidget(QWidget):
         if DEMO_MODE:
             return False
 
-        (
-            borrowed_date_custcol_name,
-            due_date_custcol_name,
-            loan_type_custcol_name,
-        ) = self.get_custom_col_names()
-
-        if (
-            borrowed_date_custcol_name
-            or due_date_custcol_name
-            or loan_type_custcol_name
-        ) and (
-            (
-                borrowed_date_custcol_name
-                and not borrowed_date_custcol_name.startswith(
-                    self.db.field_metadata.custom_field_prefix
-                )
-            )
-            or (
-                due_date_custcol_name
-                and not due_date_custcol_name.startswith(
-                    self.db.field_metadata.custom_field_prefix
-                )
-            )
-            or (
-                loan_type_custcol_name
-                and not loan_type_custcol_name.startswith(
-                    self.db.field_metadata.custom_field_prefix
-                )
-            )
+        custom_field_prefix = self.db.field_metadata.custom_field_prefix
+        if any(
+            custcol_name and not custcol_name.startswith(custom_field_prefix)
+            for custcol_name in self.get_custom_col_names()
         ):
             # We could validate more, but we'll just be replicating more
             # calibre code. Field updates failures are silently caught
@@ -848,112 +897,85 @@ class ConfigWidget(QWidget):
             return False
 
         setup_code = self.get_new_setup_code()
-        if setup_code:
-            # if libby sync code has changed, do sync and save token
-            from .libby import LibbyClient
-
-            if not LibbyClient.is_valid_sync_code(setup_code):
-                # save a http request for get_chip()
-                error_dialog(
-                    self,
-                    _("Libby Setup Code"),
-                    _("Invalid setup code format: {code}").format(code=setup_code),
-                    show=True,
-                )
-                return False
+        if setup_code and not LibbyClient.is_valid_sync_code(setup_code):
+            # save a http request for get_chip()
+            error_dialog(
+                self,
+                _("Libby Setup Code"),
+                _("Invalid setup code format: {code}").format(code=setup_code),
+                show=True,
+            )
+            return False
         return True
 
     def save_settings(self):
         if DEMO_MODE:
             return
-        PREFS[PreferenceKeys.HIDE_MAGAZINES] = self.hide_magazines_checkbox.isChecked()
-        PREFS[PreferenceKeys.HIDE_EBOOKS] = self.hide_ebooks_checkbox.isChecked()
-        PREFS[
-            PreferenceKeys.INCL_NONDOWNLOADABLE_TITLES
-        ] = self.incl_nondownloadable_checkbox.isChecked()
-        PREFS[
-            PreferenceKeys.PREFER_OPEN_FORMATS
-        ] = self.prefer_open_formats_checkbox.isChecked()
-        PREFS[
-            PreferenceKeys.HIDE_BOOKS_ALREADY_IN_LIB
-        ] = self.hide_books_already_in_lib_checkbox.isChecked()
-        PREFS[
-            PreferenceKeys.EXCLUDE_EMPTY_BOOKS
-        ] = self.exclude_empty_books_checkbox.isChecked()
-        PREFS[PreferenceKeys.TAG_EBOOKS] = self.tag_ebooks_txt.text().strip()
-        PREFS[PreferenceKeys.TAG_MAGAZINES] = self.tag_magazines_txt.text().strip()
-        PREFS[
-            PreferenceKeys.HIDE_HOLDS_UNAVAILABLE
-        ] = self.hide_holds_unavailable_checkbox.isChecked()
-        PREFS[
-            confirm_config_name(PreferenceKeys.CONFIRM_RETURNS)
-        ] = self.confirm_returns_checkbox.isChecked()
-        PREFS[
-            confirm_config_name(PreferenceKeys.CONFIRM_READ_WITH_KINDLE)
-        ] = self.confirm_readwithkindle_checkbox.isChecked()
-        PREFS[
-            PreferenceKeys.OVERDRIVELINK_INTEGRATION
-        ] = self.enable_overdrive_link_checkbox.isChecked()
-        PREFS[
-            PreferenceKeys.MARK_UPDATED_BOOKS
-        ] = self.mark_updated_books_checkbox.isChecked()
-        PREFS[
-            PreferenceKeys.ALWAYS_DOWNLOAD_AS_NEW
-        ] = self.always_download_as_new_checkbox.isChecked()
-        PREFS[PreferenceKeys.NETWORK_TIMEOUT] = int(
-            self.network_timeout_txt.cleanText().strip()
-        )
-        PREFS[PreferenceKeys.NETWORK_RETRY] = int(
-            self.network_retry_txt.cleanText().strip()
-        )
-        PREFS[PreferenceKeys.SEARCH_RESULTS_MAX] = int(
-            self.search_results_max_txt.cleanText().strip()
-        )
-        PREFS[PreferenceKeys.SEARCH_LIBRARIES] = list(
-            set(
-                [
-                    lib_key.strip().lower()
-                    for lib_key in self.search_libraries_txt.toPlainText()
-                    .strip()
-                    .split(",")
-                    if lib_key.strip()
-                ]
+        # Settings on tabs that were never shown are left as they are
+        new_prefs = {}
+        if self.is_tab_built(self.loans_tab):
+            (
+                borrowed_date_custcol_name,
+                due_date_custcol_name,
+                loan_type_custcol_name,
+            ) = self.get_custom_col_names()
+            new_prefs.update(self.get_checkbox_values(LOANS_CHECKBOX_PREFS))
+            new_prefs.update(
+                {
+                    PreferenceKeys.TAG_EBOOKS: self.tag_ebooks_txt.text().strip(),
+                    PreferenceKeys.TAG_MAGAZINES: self.tag_magazines_txt.text().strip(),
+                    PreferenceKeys.CUSTCOL_BORROWED_DATE: borrowed_date_custcol_name,
+                    PreferenceKeys.CUSTCOL_DUE_DATE: due_date_custcol_name,
+                    PreferenceKeys.CUSTCOL_LOAN_TYPE: loan_type_custcol_name,
+                }
             )
-        )[:MAX_SEARCH_LIBRARIES]
-
-        PREFS[
-            PreferenceKeys.DISABLE_TAB_MAGAZINES
-        ] = self.disable_tab_magazines_checkbox.isChecked()
-
-        (
-            borrowed_date_custcol_name,
-            due_date_custcol_name,
-            loan_type_custcol_name,
-        ) = self.get_custom_col_names()
-        PREFS[PreferenceKeys.CUSTCOL_BORROWED_DATE] = borrowed_date_custcol_name
-        PREFS[PreferenceKeys.CUSTCOL_DUE_DATE] = due_date_custcol_name
-        PREFS[PreferenceKeys.CUSTCOL_LOAN_TYPE] = loan_type_custcol_name
-
-        PREFS[PreferenceKeys.USE_BEST_COVER] = self.use_best_cover_checkbox.isChecked()
-        PREFS[PreferenceKeys.CACHE_AGE_DAYS] = int(
-            self.cache_age_txt.cleanText().strip()
-        )
+        if self.is_tab_built(self.holds_search_tab):
+            lib_keys = (
+                lib_key.strip().lower()
+                for lib_key in self.search_libraries_txt.toPlainText().split(",")
+            )
+            new_prefs.update(self.get_checkbox_values(HOLDS_CHECKBOX_PREFS))
+            new_prefs.update(
+                {
+                    PreferenceKeys.SEARCH_RESULTS_MAX: self.get_spinbox_value(
+                        self.search_results_max_txt, PreferenceKeys.SEARCH_RESULTS_MAX
+                    ),
+                    # de-duplicate while keeping the order entered
+                    PreferenceKeys.SEARCH_LIBRARIES: list(
+                        dict.fromkeys(lib_key for lib_key in lib_keys if lib_key)
+                    )[:MAX_SEARCH_LIBRARIES],
+                }
+            )
+        if self.is_tab_built(self.general_network_tab):
+            new_prefs.update(self.get_checkbox_values(GENERAL_CHECKBOX_PREFS))
+            new_prefs.update(
+                {
+                    PreferenceKeys.CACHE_AGE_DAYS: self.get_spinbox_value(
+                        self.cache_age_txt, PreferenceKeys.CACHE_AGE_DAYS
+                    ),
+                    PreferenceKeys.NETWORK_TIMEOUT: self.get_spinbox_value(
+                        self.network_timeout_txt, PreferenceKeys.NETWORK_TIMEOUT
+                    ),
+                    PreferenceKeys.NETWORK_RETRY: self.get_spinbox_value(
+                        self.network_retry_txt, PreferenceKeys.NETWORK_RETRY
+                    ),
+                }
+            )
+
+        # Only write the values that were changed, so that closing the dialog
+        # without any changes does not rewrite the JSON file
+        changed_prefs = {k: v for k, v in new_prefs.items() if PREFS[k] != v}
+        if changed_prefs:
+            # Batch the writes so that PREFS is committed to disk only once
+            with PREFS:
+                for k, v in changed_prefs.items():
+                    PREFS[k] = v
 
         setup_code = self.get_new_setup_code()
         if setup_code:
-            # if libby sync code has changed, do sync and save token
-            from .libby import LibbyClient
-
-            libby_client = LibbyClient(
-                logger=logger,
-                timeout=PREFS[PreferenceKeys.NETWORK_TIMEOUT],
-                max_retries=PREFS[PreferenceKeys.NETWORK_RETRY],
-            )
-            chip_res = libby_client.get_chip()
-            libby_client.clone_by_code(setup_code)
-            if libby_client.is_logged_in():
-                PREFS[PreferenceKeys.LIBBY_SETUP_CODE] = setup_code
-                PREFS[PreferenceKeys.LIBBY_TOKEN] = chip_res["identity"]
+            # if libby sync code has changed, sync in the background
+            # and save the new token when done
+            self.plugin_action.setup_libby(setup_code)
 
         if self.custom_column_creator and (
             self.custom_column_creator.gui.must_restart_before_config
@@ -7,8 +7,7 @@
 # See https://github.com/ping/libby-calibre-plugin for more
 # information
 #
-from threading import Lock
-from typing import Dict, List
+from typing import Dict, List, Set
 
 from calibre.constants import DEBUG
 from qt.core import (
@@ -52,6 +51,30 @@ if False:
 
 load_translations()
 
+# Keys in a library search result item that are specific to the library
+SITE_AVAILABILITY_KEYS = (
+    "advantageKey",
+    "availabilityType",
+    "availableCopies",
+    "estimatedWaitDays",
+    "formats",
+    "holdsCount",
+    "holdsRatio",
+    "isAdvantageFiltered",
+    "isAvailable",
+    "isOwned",
+    "isRecommendableToLibrary",
+    "isFastlane",
+    "isHoldable",
+    "juvenileEligible",
+    "luckyDayAvailableCopies",
+    "luckyDayOwnedCopies",
+    "ownedCopies",
+    "visitorEligible",
+    "youngAdultEligible",
+)
+_MISSING = object()
+
 
 class AdvancedSearchDialogMixin(SearchBaseDialog):
     def __init__(self, *args):
@@ -59,7 +82,6 @@ class AdvancedSearchDialogMixin(SearchBaseDialog):
 
         self._lib_search_threads: List[QThread] = []
         self._lib_search_result_sets: Dict[str, List[Dict]] = {}
-        self.lock = Lock()
 
         adv_search_widget = QWidget()
         adv_search_widget.layout = QGridLayout()
@@ -184,13 +206,8 @@ class AdvancedSearchDialogMixin(SearchBaseDialog):
             else self.show_book_details(mi.data(Qt.UserRole))
         )
         horizontal_header = self.adv_search_results_view.horizontalHeader()
-        for col_index in range(self.adv_search_model.columnCount()):
-            horizontal_header.setSectionResizeMode(
-                col_index,
-                QHeaderView_ResizeMode_Stretch
-                if col_index == 0
-                else QHeaderView_ResizeMode_ResizeToContents,
-            )
+        horizontal_header.setSectionResizeMode(QHeaderView_ResizeMode_ResizeToContents)
+        horizontal_header.setSectionResizeMode(0, QHeaderView_ResizeMode_Stretch)
         adv_search_widget.layout.addWidget(
             self.adv_search_results_view,
             widget_row_pos,
@@ -411,90 +428,71 @@ class AdvancedSearchDialogMixin(SearchBaseDialog):
         self.adv_search_btn.animateClick()
 
     def _process_search_results(self, library_key, search_items: List[Dict]):
-        with self.lock:
-            self._lib_search_result_sets[library_key] = search_items
-            found_library_keys = self._lib_search_result_sets.keys()
-            if len(found_library_keys) != len(self._lib_search_threads):
-                pending_libraries = [
-                    t.library_key
-                    for t in self._lib_search_threads
-                    if t.library_key not in found_library_keys
-                ]
-                self.status_bar.showMessage(
-                    _("Waiting for {libraries}...").format(
-                        libraries=", ".join(pending_libraries)
-                    )
+        self._lib_search_result_sets[library_key] = search_items
+        found_library_keys = self._lib_search_result_sets.keys()
+        if len(found_library_keys) != len(self._lib_search_threads):
+            pending_libraries = [
+                t.library_key
+                for t in self._lib_search_threads
+                if t.library_key not in found_library_keys
+            ]
+            self.status_bar.showMessage(
+                _("Waiting for {libraries}...").format(
+                    libraries=", ".join(pending_libraries)
                 )
-                return
-
-            self.adv_search_btn.setText(_c("Search"))
-            self.adv_search_btn.setEnabled(True)
-            self.unsetCursor()
-            self.status_bar.clearMessage()
-            combined_search_results: Dict[str, Dict] = {}
-            for lib_key, result_items in self._lib_search_result_sets.items():
-                for item_rank, item in enumerate(result_items, start=1):
-                    site_availability = {}
-                    for k in (
-                        "advantageKey",
-                        "availabilityType",
-                        "availableCopies",
-                        "estimatedWaitDays",
-                        "formats",
-                        "holdsCount",
-                        "holdsRatio",
-                        "isAdvantageFiltered",
-                        "isAvailable",
-                        "isOwned",
-                        "isRecommendableToLibrary",
-                        "isFastlane",
-                        "isHoldable",
-                        "juvenileEligible",
-                        "luckyDayAvailableCopies",
-                        "luckyDayOwnedCopies",
-                        "ownedCopies",
-                        "visitorEligible",
-                        "youngAdultEligible",
-                    ):
-                        if k in item:
-                            site_availability[k] = item.pop(k)
-                    site_availability["advantageKey"] = library_key
+            )
+            return
+
+        self.adv_search_btn.setText(_c("Search"))
+        self.adv_search_btn.setEnabled(True)
+        self.unsetCursor()
+        self.status_bar.clearMessage()
+        combined_search_results: Dict[str, Dict] = {}
+        # format ids already merged into each combined result
+        format_ids: Dict[str, Set[str]] = {}
+        for lib_key, result_items in self._lib_search_result_sets.items():
+            for item_rank, item in enumerate(result_items, start=1):
+                site_availability = {}
+                for k in SITE_AVAILABILITY_KEYS:
+                    v = item.pop(k, _MISSING)
+                    if v is not _MISSING:
+                        site_availability[k] = v
+                site_availability["advantageKey"] = lib_key
+                title_id = item["id"]
+                combined_item = combined_search_results.get(title_id)
+                if combined_item is None:
                     item.setdefault("siteAvailabilities", {})
                     item.setdefault("__item_ranks", [])
                     item.setdefault("formats", [])
-                    title_id = item["id"]
-                    combined_search_results.setdefault(title_id, item)
-                    # merge site availabilities
-                    combined_search_results[title_id]["siteAvailabilities"][
-                        lib_key
-                    ] = site_availability
-                    # merge item ranks
-                    combined_search_results[title_id]["__item_ranks"].append(item_rank)
-                    # merge formats
-                    existing_format_ids = [
-                        f["id"]
-                        for f in combined_search_results[title_id].get("formats", [])
-                    ]
-                    for f in site_availability.get("formats", []):
-                        if f["id"] not in existing_format_ids:
-                            combined_search_results[title_id]["formats"].append(f)
-
-            ordered_search_result_items = sorted(
-                combined_search_results.values(),
-                key=lambda r: (
-                    sum(r["__item_ranks"]) / len(r["__item_ranks"]),  # average rank
-                    1 / len(r["__item_ranks"]),
-                ),
-            )
-            self.status_bar.showMessage(
-                ngettext(
-                    "{n} result found",
-                    "{n} results found",
-                    len(ordered_search_result_items),
-                ).format(n=len(ordered_search_result_items)),
-                5000,
-            )
-            self.adv_search_model.sync({"search_results": ordered_search_result_items})
+                    combined_item = combined_search_results[title_id] = item
+                    format_ids[title_id] = set()
+                # merge site availabilities
+                combined_item["siteAvailabilities"][lib_key] = site_availability
+                # merge item ranks
+                combined_item["__item_ranks"].append(item_rank)
+                # merge formats
+                existing_format_ids = format_ids[title_id]
+                for f in site_availability.get("formats", []):
+                    if f["id"] not in existing_format_ids:
+                        existing_format_ids.add(f["id"])
+                        combined_item["formats"].append(f)
+
+        ordered_search_result_items = sorted(
+            combined_search_results.values(),
+            key=lambda r: (
+                sum(r["__item_ranks"]) / len(r["__item_ranks"]),  # average rank
+                1 / len(r["__item_ranks"]),
+            ),
+        )
+        self.status_bar.showMessage(
+            ngettext(
+                "{n} result found",
+                "{n} results found",
+                len(ordered_search_result_items),
+            ).format(n=len(ordered_search_result_items)),
+            5000,
+        )
+        self.adv_search_model.sync({"search_results": ordered_search_result_items})
 
     def _get_adv_search_thread(
         self, overdrive_client, library_key: str, query: LibraryMediaSearchParams
@@ -524,7 +522,8 @@ class AdvancedSearchDialogMixin(SearchBaseDialog):
             )
             self._process_search_results(lib_key, [])
 
-        worker.finished.connect(lambda lib_key, results: done(lib_key, results))
-        worker.errored.connect(lambda lib_key, err: errored_out(lib_key, err))
+        # queued so that results are always merged on the GUI thread, one at a time
+        worker.finished.connect(done, type=Qt.QueuedConnection)
+        worker.errored.connect(errored_out, type=Qt.QueuedConnection)
 
         return thread
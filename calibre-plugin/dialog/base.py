@@ -132,7 +132,7 @@ class BaseDialogMixin(QDialog):
         media_cache: SimpleCache,
     ):
         super().__init__(gui)
-        self.setAttribute(Qt.WA_DeleteOnClose)
+        # not deleted on close so that the plugin can reuse the dialog
         self.gui = gui
         self.do_user_config = do_user_config
         self.resources = resources
@@ -202,7 +202,7 @@ class BaseDialogMixin(QDialog):
         new_width = dialog_size.width()
         new_height = dialog_size.height()
         if PREFS[PreferenceKeys.MAIN_UI_WIDTH] != new_width:
-            PREFS[PreferenceKeys.MAIN_UI_HEIGHT] = new_width
+            PREFS[PreferenceKeys.MAIN_UI_WIDTH] = new_width
             logger.debug("Saved new UI width preference: %d", new_width)
         if PREFS[PreferenceKeys.MAIN_UI_HEIGHT] != new_height:
             PREFS[PreferenceKeys.MAIN_UI_HEIGHT] = new_height
@@ -405,6 +405,25 @@ class BaseDialogMixin(QDialog):
         search_conditions = self.generate_search_conditions(media)
         self.gui.search.set_search_string(" or ".join(search_conditions))
 
+    def set_libby_token(self, identity_token: str):
+        """
+        Use a new Libby identity token, e.g. after Libby is set up with a setup code.
+
+        :param identity_token:
+        :return:
+        """
+        if self.client:
+            self.client.identity_token = identity_token
+        else:
+            self.client = LibbyClient(
+                identity_token=identity_token,
+                max_retries=PREFS[PreferenceKeys.NETWORK_RETRY],
+                timeout=PREFS[PreferenceKeys.NETWORK_TIMEOUT],
+                logger=logger,
+            )
+        if self.isVisible():
+            self.sync()
+
     def sync(self):
         if not self.client:
             self.status_bar.showMessage(_("Libby is not configured yet."))
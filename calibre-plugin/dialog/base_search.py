@@ -7,7 +7,6 @@
 # See https://github.com/ping/libby-calibre-plugin for more
 # information
 #
-import copy
 
 from qt.core import Qt, QMenu, QIcon, QCursor
 
@@ -97,24 +96,24 @@ class SearchBaseDialog(BaseDialogMixin):
 
         available_sites = self.get_available_sites(media, model)
 
-        borrow_sites = [
-            s
-            for s in available_sites
-            if s.get("isAvailable") or s.get("luckyDayAvailableCopies")
-        ]
-        hold_sites = [
-            s
-            for s in available_sites
-            if not (s.get("isAvailable") or s.get("luckyDayAvailableCopies"))
-        ]
+        borrow_sites = []
+        hold_sites = []
+        for s in available_sites:
+            if s.get("isAvailable") or s.get("luckyDayAvailableCopies"):
+                borrow_sites.append(s)
+            else:
+                hold_sites.append(s)
         if borrow_sites:
             borrow_menu = QMenu()
             borrow_menu.setToolTipsVisible(True)
             for site in borrow_sites:
                 cards = model.get_cards_for_library_key(site["advantageKey"])
+                # same for all the cards of the library
+                card_icon = QIcon(self.get_card_pixmap(site["__library"]))
+                library_name = f'<b>{site["__library"]["name"]}</b>'
                 for card in cards:
                     card_action = borrow_menu.addAction(
-                        QIcon(self.get_card_pixmap(site["__library"])),
+                        card_icon,
                         truncate_for_display(
                             f'{card["advantageKey"]}: {card["cardName"] or ""}',
                             font=borrow_menu.font(),
@@ -125,7 +124,7 @@ class SearchBaseDialog(BaseDialogMixin):
                             self._wrap_for_rich_text(
                                 "<br>".join(
                                     [
-                                        f'<b>{site["__library"]["name"]}</b>',
+                                        library_name,
                                         _("This card is out of loans."),
                                     ]
                                 )
@@ -139,7 +138,7 @@ class SearchBaseDialog(BaseDialogMixin):
                             self._wrap_for_rich_text(
                                 "<br>".join(
                                     [
-                                        f'<b>{site["__library"]["name"]}</b>',
+                                        library_name,
                                         _("You already have a loan for this title."),
                                     ]
                                 )
@@ -149,12 +148,12 @@ class SearchBaseDialog(BaseDialogMixin):
                         continue
 
                     card_action.setToolTip(self._borrow_tooltip(media, site))
-                    media_for_borrow = copy.deepcopy(media)
-                    media_for_borrow["cardId"] = card["cardId"]
                     card_action.triggered.connect(
                         # this is from the holds tab
-                        lambda checked, m=media_for_borrow, s=site: self.borrow_hold(
-                            m,
+                        # only the top-level cardId differs, so a shallow copy
+                        # of media made when triggered is enough
+                        lambda checked, c=card["cardId"], s=site: self.borrow_hold(
+                            {**media, "cardId": c},
                             availability=s,
                             do_download=not borrow_action_default_is_borrow,
                         )
@@ -172,9 +171,12 @@ class SearchBaseDialog(BaseDialogMixin):
             hold_menu.setToolTipsVisible(True)
             for site in hold_sites:
                 cards = model.get_cards_for_library_key(site["advantageKey"])
+                # same for all the cards of the library
+                card_icon = QIcon(self.get_card_pixmap(site["__library"]))
+                library_name = f'<b>{site["__library"]["name"]}</b>'
                 for card in cards:
                     card_action = hold_menu.addAction(
-                        QIcon(self.get_card_pixmap(site["__library"])),
+                        card_icon,
                         truncate_for_display(
                             f'{card["advantageKey"]}: {card["cardName"] or ""}',
                             font=hold_menu.font(),
@@ -185,7 +187,7 @@ class SearchBaseDialog(BaseDialogMixin):
                             self._wrap_for_rich_text(
                                 "<br>".join(
                                     [
-                                        f'<b>{site["__library"]["name"]}</b>',
+                                        library_name,
                                         _("This card is out of holds."),
                                     ]
                                 )
@@ -198,7 +200,7 @@ class SearchBaseDialog(BaseDialogMixin):
                             self._wrap_for_rich_text(
                                 "<br>".join(
                                     [
-                                        f'<b>{site["__library"]["name"]}</b>',
+                                        library_name,
                                         _("You already have a hold for this title."),
                                     ]
                                 )
@@ -111,13 +111,8 @@ class HoldsDialogMixin(BaseDialogMixin):
             self, model=self.holds_search_proxy_model, min_width=self.min_view_width
         )
         horizontal_header = self.holds_view.horizontalHeader()
-        for col_index in range(self.holds_model.columnCount()):
-            horizontal_header.setSectionResizeMode(
-                col_index,
-                QHeaderView_ResizeMode_Stretch
-                if col_index == 0
-                else QHeaderView_ResizeMode_ResizeToContents,
-            )
+        horizontal_header.setSectionResizeMode(QHeaderView_ResizeMode_ResizeToContents)
+        horizontal_header.setSectionResizeMode(0, QHeaderView_ResizeMode_Stretch)
         self.holds_view.setSelectionMode(QAbstractItemView.SingleSelection)
         # add debug trigger
         self.holds_view.doubleClicked.connect(
@@ -111,13 +111,8 @@ class LoansDialogMixin(BaseDialogMixin):
             self, model=self.loans_search_proxy_model, min_width=self.min_view_width
         )
         horizontal_header = self.loans_view.horizontalHeader()
-        for col_index in range(self.loans_model.columnCount()):
-            horizontal_header.setSectionResizeMode(
-                col_index,
-                QHeaderView_ResizeMode_Stretch
-                if col_index == 0
-                else QHeaderView_ResizeMode_ResizeToContents,
-            )
+        horizontal_header.setSectionResizeMode(QHeaderView_ResizeMode_ResizeToContents)
+        horizontal_header.setSectionResizeMode(0, QHeaderView_ResizeMode_Stretch)
         # add context menu
         self.loans_view.customContextMenuRequested.connect(
             self.loans_view_context_menu_requested
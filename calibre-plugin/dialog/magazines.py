@@ -161,13 +161,8 @@ class MagazinesDialogMixin(BaseDialogMixin):
             self, model=self.magazines_search_proxy_model, min_width=self.min_view_width
         )
         horizontal_header = self.magazines_view.horizontalHeader()
-        for col_index in range(self.magazines_model.columnCount()):
-            horizontal_header.setSectionResizeMode(
-                col_index,
-                QHeaderView_ResizeMode_Stretch
-                if col_index == 0
-                else QHeaderView_ResizeMode_ResizeToContents,
-            )
+        horizontal_header.setSectionResizeMode(QHeaderView_ResizeMode_ResizeToContents)
+        horizontal_header.setSectionResizeMode(0, QHeaderView_ResizeMode_Stretch)
         self.magazines_view.setSelectionMode(QAbstractItemView.SingleSelection)
         # add context menu
         self.magazines_view.customContextMenuRequested.connect(
@@ -87,13 +87,8 @@ class SearchDialogMixin(SearchBaseDialog):
         )
         self.search_results_view.setSelectionMode(QAbstractItemView.SingleSelection)
         horizontal_header = self.search_results_view.horizontalHeader()
-        for col_index in range(self.search_model.columnCount()):
-            horizontal_header.setSectionResizeMode(
-                col_index,
-                QHeaderView_ResizeMode_Stretch
-                if col_index == 0
-                else QHeaderView_ResizeMode_ResizeToContents,
-            )
+        horizontal_header.setSectionResizeMode(QHeaderView_ResizeMode_ResizeToContents)
+        horizontal_header.setSectionResizeMode(0, QHeaderView_ResizeMode_Stretch)
         # context menu
         self.search_results_view.customContextMenuRequested.connect(
             self.search_results_view_context_menu_requested
@@ -144,7 +144,8 @@ class LibbyClient(object):
 
     @staticmethod
     def is_valid_sync_code(code: str) -> bool:
-        return code.isdigit() and len(code) == 8
+        # isdigit() alone also accepts non-ASCII digits, e.g. "²" or "٣"
+        return len(code) == 8 and code.isascii() and code.isdigit()
 
     def default_headers(self) -> Dict:
         """
@@ -25,12 +25,18 @@ from qt.core import (
 )
 
 from . import DEMO_MODE
-from .compat import QColor_fromString, _c
+from .compat import _c
 from .config import MAX_SEARCH_LIBRARIES, PREFS, PreferenceKeys
 from .libby import LibbyClient
 from .libby.client import LibbyFormats, LibbyMediaTypes
 from .overdrive import OverDriveClient
-from .utils import PluginColors, PluginImages, obfuscate_date, obfuscate_name
+from .utils import (
+    PluginColors,
+    PluginImages,
+    get_qcolor,
+    obfuscate_date,
+    obfuscate_name,
+)
 
 # noinspection PyUnreachableCode
 if False:
@@ -350,7 +356,7 @@ class LibbyLoansModel(LibbyModel):
             return Qt.AlignCenter
         # ForegroundRole
         if role == Qt.ForegroundRole and col == 2 and LibbyClient.is_renewable(loan):
-            return QColor_fromString(PluginColors.Red)
+            return get_qcolor(PluginColors.Red)
         card = self.get_card(loan["cardId"])
         # ToolTipRole
         if role == Qt.ToolTipRole:
@@ -607,7 +613,7 @@ class LibbyHoldsModel(LibbyModel):
         hold_available = hold.get("isAvailable", False)
         # ForegroundRole
         if role == Qt.ForegroundRole and col == 2 and hold_available:
-            return QColor_fromString(PluginColors.Red)
+            return get_qcolor(PluginColors.Red)
         # FontRole
         if role == Qt.FontRole and col == 5 and hold_available:
             font = QFont()
@@ -7,6 +7,7 @@
 # See https://github.com/ping/libby-calibre-plugin for more
 # information
 #
+import hashlib
 import json
 import logging
 import math
@@ -14,6 +15,7 @@ import os
 import platform
 import random
 import re
+import shutil
 import time
 import unicodedata
 from collections import OrderedDict, namedtuple
@@ -21,15 +23,16 @@ from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
 from threading import Lock
-from typing import Dict, Optional
+from typing import Dict, Mapping, Optional
 
 from calibre.constants import DEBUG as CALIBRE_DEBUG
 from calibre.gui2 import is_dark_theme
 from calibre.utils.logging import DEBUG, ERROR, INFO, WARN
-from qt.core import QColor, QIcon, QPainter, QPixmap, QSvgRenderer, QXmlStreamReader
+from qt.core import QByteArray, QColor, QIcon, QPainter, QPixmap, QSvgRenderer
 
-from . import PLUGIN_NAME
+from . import PLUGIN_NAME, logger
 from .compat import (
+    QColor_fromString,
     QPainter_CompositionMode_CompositionMode_SourceIn,
     Qt_GlobalColor_transparent,
 )
@@ -152,6 +155,19 @@ class SimpleCache:
             self.cache.clear()
             self._load_from_file()
 
+    def set_cache_age_days(self, cache_age_days: int) -> bool:
+        """
+        Update the cache age. The file cache is only reloaded if the value has changed.
+
+        :param cache_age_days:
+        :return: True if the cache was reloaded
+        """
+        if cache_age_days == self.cache_age_days:
+            return False
+        self.cache_age_days = cache_age_days
+        self.reload()
+        return True
+
     def save(self):
         if not self.persist_to_path:
             return
@@ -290,10 +306,60 @@ def rating_to_stars(value, star="★", half="⯨"):
     return t
 
 
+# parsed QColors keyed by hex string
+_QCOLOR_CACHE: Dict[str, QColor] = {}
+
+
+def get_qcolor(color: str) -> QColor:
+    """
+    Returns a QColor for a hex color string, e.g. a PluginColors value.
+    Parsed colors are cached since the same few colors are used repeatedly.
+    The returned QColor is shared and should not be modified.
+
+    :param color:
+    :return:
+    """
+    color = str(color)
+    qcolor = _QCOLOR_CACHE.get(color)
+    if qcolor is None:
+        qcolor = QColor_fromString(color)
+        _QCOLOR_CACHE[color] = qcolor
+    return qcolor
+
+
 def svg_to_pixmap(
-    data: bytes, color: Optional[QColor] = None, size=(64, 64)
+    data: bytes,
+    color: Optional[QColor] = None,
+    size=(64, 64),
+    cache_dir: Optional[Path] = None,
 ) -> QPixmap:
-    renderer = QSvgRenderer(QXmlStreamReader(data))
+    """
+    Renders an SVG into a QPixmap, optionally tinted with a color.
+
+    If `cache_dir` is specified, the rendered pixmap is persisted there as a PNG
+    so that subsequent calls can skip the SVG parse/render.
+
+    :param data:
+    :param color:
+    :param size:
+    :param cache_dir:
+    :return:
+    """
+    cache_path: Optional[Path] = None
+    if cache_dir:
+        cache_key = hashlib.blake2b(
+            data
+            + (color.name() if color else "").encode("utf-8")
+            + str(size).encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+        cache_path = cache_dir.joinpath(f"{cache_key}.png")
+        if cache_path.exists():
+            pixmap = QPixmap()
+            if pixmap.load(str(cache_path), "PNG"):
+                return pixmap
+
+    renderer = QSvgRenderer(QByteArray(data))
     pixmap = QPixmap(*size)
     pixmap.fill(Qt_GlobalColor_transparent)
     painter = QPainter(pixmap)
@@ -302,19 +368,56 @@ def svg_to_pixmap(
     if color:
         painter.fillRect(pixmap.rect(), color)
     painter.end()
+
+    if cache_path:
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as err:
+            logger.warning("Unable to create icon cache folder %s: %s", cache_dir, err)
+        else:
+            if not pixmap.save(str(cache_path), "PNG"):
+                logger.warning("Unable to cache icon to %s", cache_path)
     return pixmap
 
 
-def svg_to_qicon(data: bytes, color: Optional[QColor] = None, size=(64, 64)):
+def clear_icon_cache(cache_root: Path, keep: Optional[Path] = None):
+    """
+    Deletes the cached icon PNGs, e.g. those from other plugin versions.
+
+    :param cache_root: Folder containing the icon cache folders
+    :param keep: Cache folder to leave in place
+    :return:
+    """
+    if not cache_root.exists():
+        return
+    for cache_path in cache_root.iterdir():
+        if keep and cache_path == keep:
+            continue
+        try:
+            if cache_path.is_dir():
+                shutil.rmtree(cache_path)
+            else:
+                cache_path.unlink()
+        except OSError as err:
+            logger.warning("Unable to delete cached icons %s: %s", cache_path, err)
+
+
+def svg_to_qicon(
+    data: bytes,
+    color: Optional[QColor] = None,
+    size=(64, 64),
+    cache_dir: Optional[Path] = None,
+):
     """
     Converts an SVG to QIcon
 
     :param data:
     :param color:
     :param size:
+    :param cache_dir: Optional folder to cache the rendered PNG in
     :return:
     """
-    return QIcon(svg_to_pixmap(data, color, size))
+    return QIcon(svg_to_pixmap(data, color, size, cache_dir))
 
 
 class PluginColors(str, Enum):
@@ -426,3 +529,38 @@ ICON_MAP = {
         file="images/arrow-left-right-line.svg", color=PluginColors.Turquoise
     ),
 }
+
+
+class LazyResources(dict):
+    """
+    Plugin resources that renders an icon (or the cover placeholder) only when
+    it is first accessed instead of rendering everything when the plugin loads.
+    """
+
+    def __init__(
+        self,
+        image_resources: Mapping[str, bytes],
+        cache_dir: Optional[Path] = None,
+        device_pixel_ratio: float = 1.0,
+    ):
+        super().__init__()
+        self.image_resources = image_resources
+        self.cache_dir = cache_dir
+        self.device_pixel_ratio = device_pixel_ratio
+
+    def __missing__(self, key):
+        if key == PluginImages.CoverPlaceholder:
+            resource = QPixmap(150, 200)
+            resource.loadFromData(self.image_resources[COVER_PLACEHOLDER])
+            resource.setDevicePixelRatio(self.device_pixel_ratio)
+        elif key in ICON_MAP:
+            icon_definition = ICON_MAP[key]
+            resource = svg_to_qicon(
+                self.image_resources[icon_definition.file],
+                get_qcolor(icon_definition.color),
+                cache_dir=self.cache_dir,
+            )
+        else:
+            raise KeyError(key)
+        self[key] = resource
+        return resource
@@ -346,6 +346,35 @@ def extract_cached_items(
     return uncached_object_ids, cached_objects
 
 
+class LibbySetupCodeWorker(QObject):
+    """
+    Sets up Libby with a setup code generated from another device
+    """
+
+    finished = pyqtSignal(str)
+    errored = pyqtSignal(Exception)
+
+    def setup(self, libby_client: LibbyClient, setup_code: str):
+        self.client = libby_client
+        self.setup_code = setup_code
+
+    def run(self):
+        total_start = timer()
+        try:
+            chip_res = self.client.get_chip()
+            self.client.clone_by_code(self.setup_code)
+            identity_token = chip_res["identity"] if self.client.is_logged_in() else ""
+            logger.info(
+                "Total Libby Setup Code Clone took %f seconds", timer() - total_start
+            )
+            self.finished.emit(identity_token)
+        except Exception as err:
+            logger.info(
+                "Libby Setup Code Clone failed after %f seconds", timer() - total_start
+            )
+            self.errored.emit(err)
+
+
 class SyncDataWorker(QObject):
     """
     Main sync worker
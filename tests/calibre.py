@@ -1,10 +1,25 @@
 import logging
 import sys
+import tempfile
 import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 from calibre.gui2 import ensure_app, destroy_app
 
 
+class TestPrefs(dict):
+    """
+    A dict that can be used like calibre's JSONConfig in a with block
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
 class CalibreTests(unittest.TestCase):
     def test_rating_to_stars(self):
         from calibre_plugins.overdrive_libby.utils import rating_to_stars
@@ -22,6 +37,29 @@ class CalibreTests(unittest.TestCase):
             generate_od_identifier({"id": "1234"}, {"preferredKey": "abc"}),
         )
 
+    def test_hex_to_rgb(self):
+        from calibre_plugins.overdrive_libby.compat import hex_to_rgb
+
+        self.assertEqual((255, 255, 255), hex_to_rgb("#FFFFFF"))
+        self.assertEqual((231, 14, 0), hex_to_rgb("#e70e00"))
+        self.assertEqual((255, 0, 51), hex_to_rgb("#F03"))
+        with self.assertRaises(ValueError):
+            hex_to_rgb("FFFFFF")
+        with self.assertRaises(ValueError):
+            hex_to_rgb("#FFFF")
+        with self.assertRaises(ValueError):
+            hex_to_rgb("#GGGGGG")
+
+    def test_custom_column_lookup_name(self):
+        from calibre_plugins.overdrive_libby.config import custom_column_lookup_name
+
+        self.assertEqual(
+            "#libby_borrowed_date", custom_column_lookup_name("#", "borrowed date")
+        )
+        self.assertEqual(
+            "#libby_loan_type", custom_column_lookup_name("#", "Loan Type")
+        )
+
     def test_simplecache(self):
         from calibre_plugins.overdrive_libby.utils import SimpleCache
 
@@ -43,6 +81,34 @@ class CalibreTests(unittest.TestCase):
         cache.clear()
         self.assertEqual(cache.count(), 0)
 
+    def test_simplecache_set_cache_age_days(self):
+        from calibre_plugins.overdrive_libby.utils import SimpleCache
+
+        cache = SimpleCache(cache_age_days=3)
+        cache.put("a", {"a": 1})
+        self.assertFalse(cache.set_cache_age_days(3))
+        self.assertEqual(cache.count(), 1)
+        self.assertTrue(cache.set_cache_age_days(5))
+        self.assertEqual(cache.cache_age_days, 5)
+
+    def test_clear_icon_cache(self):
+        from calibre_plugins.overdrive_libby.utils import clear_icon_cache
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_root = Path(temp_dir)
+            keep = cache_root.joinpath("0.1.10")
+            old = cache_root.joinpath("0.1.9")
+            for cache_dir in (keep, old):
+                cache_dir.mkdir()
+                cache_dir.joinpath("icon.png").write_bytes(b"")
+            cache_root.joinpath("icon.png").write_bytes(b"")
+
+            clear_icon_cache(cache_root, keep=keep)
+            self.assertEqual(list(cache_root.iterdir()), [keep])
+            clear_icon_cache(cache_root)
+            self.assertEqual(list(cache_root.iterdir()), [])
+        clear_icon_cache(cache_root)  # no error when the folder is missing
+
     def test_truncate_for_display(self):
         from calibre_plugins.overdrive_libby.models import truncate_for_display
 
@@ -67,6 +133,72 @@ class CalibreTests(unittest.TestCase):
             ),
         )
 
+    def _setup_code_prefs(self):
+        from calibre_plugins.overdrive_libby.config import PreferenceKeys
+
+        return TestPrefs(
+            {
+                PreferenceKeys.LIBBY_SETUP_CODE: "",
+                PreferenceKeys.LIBBY_TOKEN: "",
+                PreferenceKeys.NETWORK_TIMEOUT: 30,
+                PreferenceKeys.NETWORK_RETRY: 1,
+            }
+        )
+
+    @patch("calibre_plugins.overdrive_libby.action.LibbyClient")
+    def test_setup_libby_success(self, _):
+        from calibre_plugins.overdrive_libby.action import OverdriveLibbyAction
+        from calibre_plugins.overdrive_libby.config import PreferenceKeys
+
+        action = MagicMock()
+        prefs = self._setup_code_prefs()
+        with patch("calibre_plugins.overdrive_libby.action.PREFS", prefs), patch(
+            "calibre_plugins.overdrive_libby.action.error_dialog"
+        ) as error_dialog_mock:
+            thread = OverdriveLibbyAction._get_setup_code_thread(action, "12345678")
+            thread.worker.finished.emit("abcd")
+
+        self.assertEqual("12345678", prefs[PreferenceKeys.LIBBY_SETUP_CODE])
+        self.assertEqual("abcd", prefs[PreferenceKeys.LIBBY_TOKEN])
+        action.main_dialog.set_libby_token.assert_called_once_with("abcd")
+        error_dialog_mock.assert_not_called()
+
+    @patch("calibre_plugins.overdrive_libby.action.LibbyClient")
+    def test_setup_libby_rejected(self, _):
+        from calibre_plugins.overdrive_libby.action import OverdriveLibbyAction
+
+        action = MagicMock()
+        prefs = self._setup_code_prefs()
+        expected_prefs = dict(prefs)
+        with patch("calibre_plugins.overdrive_libby.action.PREFS", prefs), patch(
+            "calibre_plugins.overdrive_libby.action.error_dialog"
+        ) as error_dialog_mock:
+            thread = OverdriveLibbyAction._get_setup_code_thread(action, "12345678")
+            thread.worker.finished.emit("")
+
+        error_dialog_mock.assert_called_once()
+        self.assertEqual(expected_prefs, prefs)
+        action.main_dialog.set_libby_token.assert_not_called()
+
+    def test_setup_libby_queued(self):
+        from calibre_plugins.overdrive_libby.action import OverdriveLibbyAction
+
+        action = MagicMock()
+        action._setup_code_thread.isRunning.return_value = True
+        action._pending_setup_code = ""
+        OverdriveLibbyAction.setup_libby(action, "12345678")
+        OverdriveLibbyAction.setup_libby(action, "87654321")
+        # no new thread while a setup is running, only the latest code is kept
+        action._get_setup_code_thread.assert_not_called()
+        self.assertEqual("87654321", action._pending_setup_code)
+
+        with patch(
+            "calibre_plugins.overdrive_libby.action.PREFS", self._setup_code_prefs()
+        ):
+            OverdriveLibbyAction._setup_code_thread_finished(action)
+        self.assertEqual("", action._pending_setup_code)
+        action.setup_libby.assert_called_once_with("87654321")
+
     def test_log_handler(self):
         from calibre.utils.logging import Log, DEBUG
         from calibre_plugins.overdrive_libby.utils import create_job_logger
@@ -273,6 +273,18 @@ class LibbyClientTests(BaseTests):
             LibbyFormats.EBookOverdrive,
         )
 
+    def test_is_valid_sync_code(self):
+        self.assertTrue(LibbyClient.is_valid_sync_code("12345678"))
+        for code in (
+            "1234567",
+            "123456789",
+            "1234567a",
+            "１２３４５６７８",
+            "²2345678",
+        ):
+            with self.subTest(code=code):
+                self.assertFalse(LibbyClient.is_valid_sync_code(code))
+
     def test_parse_datetime(self):
         for value in (
             "2017-06-06T04:00:00Z",  # estimatedReleaseDate, publishDate